@@ -1,22 +1,45 @@
+import argparse
 import PyInstaller.__main__
 import shutil
 from pathlib import Path
 
+from web.templating import COMPILED_TEMPLATES_NAME, compile_templates
+
 PROJECT_ROOT = Path(__file__).resolve().parent
 ICON_PATH = PROJECT_ROOT / 'web' / 'static' / 'resources' / 'auto_arranger.ico'
+COMPILED_TEMPLATES_PATH = PROJECT_ROOT / 'build' / COMPILED_TEMPLATES_NAME
+
+parser = argparse.ArgumentParser(description="AutoArranger の実行ファイルをビルド")
+parser.add_argument(
+    '--dev',
+    action='store_true',
+    help="開発用ビルド（--onedir、前回の build/ 解析キャッシュを再利用）",
+)
+parser.add_argument(
+    '--onefile',
+    action='store_true',
+    help="単一exeでビルド（起動のたびに一時フォルダへ展開されるため起動が遅い）",
+)
+cli_args = parser.parse_args()
+onefile = cli_args.onefile and not cli_args.dev
+
+# Clean previous build（開発用ビルドでは解析キャッシュを残す）
+if not cli_args.dev:
+    if Path("dist").exists():
+        shutil.rmtree("dist")
+    if Path("build").exists():
+        shutil.rmtree("build")
 
-# Clean previous build
-if Path("dist").exists():
-    shutil.rmtree("dist")
-if Path("build").exists():
-    shutil.rmtree("build")
+# テンプレートを事前コンパイル（exe起動後の初回描画でのコンパイルを省く）
+compile_templates(PROJECT_ROOT / 'web' / 'templates', COMPILED_TEMPLATES_PATH)
 
 args = [
     'main.py',
     '--name=AutoArranger',
-    '--onefile',
+    '--onefile' if onefile else '--onedir',
     '--noconsole',  # コンソールウィンドウを非表示
     '--add-data=web/templates;web/templates',
+    f'--add-data={COMPILED_TEMPLATES_PATH};web',
     '--add-data=web/static;web/static',
     '--add-data=config;config',  # Default configs
     '--hidden-import=uvicorn.logging',
@@ -31,9 +54,12 @@ args = [
     '--hidden-import=pandas',
     '--hidden-import=yaml',
     '--hidden-import=webview',  # pywebview
-    '--clean',
+    '--noconfirm',  # dist/ の上書き確認を出さない
 ]
 
+if not cli_args.dev:
+    args.append('--clean')
+
 # Check for icon
 if ICON_PATH.exists():
     print(f"Icon found at: {ICON_PATH}")
@@ -43,4 +69,9 @@ else:
 
 PyInstaller.__main__.run(args)
 
-print("Build complete. Executable is in 'dist' folder.")
+if onefile or cli_args.dev:
+    print("Build complete. Executable is in 'dist' folder.")
+else:
+    # 配布用にフォルダごとzip化
+    archive = shutil.make_archive('dist/AutoArranger', 'zip', 'dist', 'AutoArranger')
+    print(f"Build complete. Distribute '{archive}' (run AutoArranger/AutoArranger.exe).")
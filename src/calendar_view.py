@@ -25,6 +25,17 @@ def build_calendar_print_data(
     today_date = today or date.today()
     parsed_ng = _parse_ng_dates(ng_dates)
 
+    # 表示するカレンダー全体（前後月のはみ出し分を含む）の日付→NGメンバーを一括で展開
+    calendar_builder = calendar.Calendar(firstweekday=6)
+    span_start = calendar_builder.monthdatescalendar(start_date.year, start_date.month)[0][0]
+    span_end = calendar_builder.monthdatescalendar(end_date.year, end_date.month)[-1][-1]
+    parsed_ng["unavailable_by_date"] = _build_unavailable_members_by_date(
+        parsed_ng["by_member_dates"],
+        parsed_ng["by_member_periods"],
+        span_start,
+        span_end,
+    )
+
     day_schedule = schedule.get("day", {})
     night_schedule = schedule.get("night", {})
     night_by_date = _expand_night_schedule(night_schedule)
@@ -129,11 +140,7 @@ def _build_day_cell(
             if member:
                 night_members.append(member)
 
-    member_ng_members = _collect_members_unavailable_on_date(
-        target_date,
-        parsed_ng["by_member_dates"],
-        parsed_ng["by_member_periods"],
-    )
+    member_ng_members = list(parsed_ng["unavailable_by_date"].get(target_date, []))
 
     return {
         "date": target_date,
@@ -141,7 +148,7 @@ def _build_day_cell(
         "in_month": target_date.month == target_month,
         "in_range": start_date <= target_date <= end_date,
         "is_today": target_date == today,
-        "is_weekend": target_date.weekday() in [5, 6],
+        "is_weekend": target_date.weekday() >= 5,
         "day_assignments": day_assignments,
         "night_members": night_members,
         "night_week_start": night_info["week_start"] if night_info else None,
@@ -162,11 +169,7 @@ def _build_daily_ng_rows(
     cursor = start_date
     while cursor <= end_date:
         is_global_ng = cursor in parsed_ng["global_dates"]
-        members = _collect_members_unavailable_on_date(
-            cursor,
-            parsed_ng["by_member_dates"],
-            parsed_ng["by_member_periods"],
-        )
+        members = list(parsed_ng["unavailable_by_date"].get(cursor, []))
         if is_global_ng or members:
             rows.append(
                 {
@@ -290,24 +293,32 @@ def _parse_periods(values: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return periods
 
 
-def _collect_members_unavailable_on_date(
-    target_date: date,
+def _build_unavailable_members_by_date(
     by_member_dates: Dict[str, Set[date]],
     by_member_periods: Dict[str, List[Dict[str, Any]]],
-) -> List[str]:
-    members = set()
+    span_start: date,
+    span_end: date,
+) -> Dict[date, List[str]]:
+    """表示範囲内の日付ごとに、個別NG・期間NGのメンバー（名前順）をまとめる。"""
+    members_by_date: Dict[date, Set[str]] = {}
 
     for member, dates in by_member_dates.items():
-        if target_date in dates:
-            members.add(member)
+        for target_date in dates:
+            if span_start <= target_date <= span_end:
+                members_by_date.setdefault(target_date, set()).add(member)
 
     for member, periods in by_member_periods.items():
         for period in periods:
-            if period["start"] <= target_date <= period["end"]:
-                members.add(member)
-                break
+            cursor = max(period["start"], span_start)
+            last = min(period["end"], span_end)
+            while cursor <= last:
+                members_by_date.setdefault(cursor, set()).add(member)
+                cursor += timedelta(days=1)
 
-    return sorted(members)
+    return {
+        target_date: sorted(members)
+        for target_date, members in members_by_date.items()
+    }
 
 
 def _format_member_preview(members: List[str], *, max_names: int = 3) -> str:
@@ -7,6 +7,12 @@ from typing import Dict, List
 import pandas as pd
 from utils.logger import setup_logger
 
+# libyamlが使える環境ではC実装のダンパーを使用（出力内容は同じ）
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 logger = setup_logger(__name__)
 
 
@@ -46,10 +52,13 @@ class ConfigGenerator:
         night_index_1_group = []
         night_index_2_group = []
 
-        for member, stats in member_stats.items():
+        # 名前順に1回だけ走査し、各グループを最初から名前順で構築する
+        for member in sorted(member_stats):
+            stats = member_stats[member]
+
             # 日勤分類
             if stats['day_count'] > 0:
-                day_indexes = stats['day_indexes']
+                day_indexes = set(stats['day_indexes'])
                 if 3 in day_indexes:
                     # index 3に出現したことがある → index_3_group
                     day_index_3_group.append({'name': member, 'active': True})
@@ -59,7 +68,7 @@ class ConfigGenerator:
 
             # 夜勤分類
             if stats['night_count'] > 0:
-                night_indexes = stats['night_indexes']
+                night_indexes = set(stats['night_indexes'])
                 if 2 in night_indexes:
                     # index 2に出現したことがある → index_2_group
                     member_config = {'name': member, 'active': True}
@@ -75,18 +84,18 @@ class ConfigGenerator:
         reference_date = matsuda_last_date
         if matsuda_last_date == "auto" and '松田' in member_stats:
             reference_date = member_stats['松田']['last_date'].isoformat()
-            logger.info(f"松田さんの基準日を自動検出: {reference_date}")
+            logger.info("松田さんの基準日を自動検出: %s", reference_date)
 
         # 設定辞書を構築
         config = {
             'members': {
                 'day_shift': {
-                    'index_1_2_group': sorted(day_index_1_2_group, key=lambda x: x['name']),
-                    'index_3_group': sorted(day_index_3_group, key=lambda x: x['name'])
+                    'index_1_2_group': day_index_1_2_group,
+                    'index_3_group': day_index_3_group
                 },
                 'night_shift': {
-                    'index_1_group': sorted(night_index_1_group, key=lambda x: x['name']),
-                    'index_2_group': sorted(night_index_2_group, key=lambda x: x['name'])
+                    'index_1_group': night_index_1_group,
+                    'index_2_group': night_index_2_group
                 }
             },
             'matsuda_schedule': {
@@ -136,11 +145,11 @@ class ConfigGenerator:
             }
         }
 
-        logger.info(f"メンバー分類完了:")
-        logger.info(f"  日勤 index 1,2: {len(day_index_1_2_group)}名")
-        logger.info(f"  日勤 index 3: {len(day_index_3_group)}名")
-        logger.info(f"  夜勤 index 1: {len(night_index_1_group)}名")
-        logger.info(f"  夜勤 index 2: {len(night_index_2_group)}名")
+        logger.info("メンバー分類完了:")
+        logger.info("  日勤 index 1,2: %d名", len(day_index_1_2_group))
+        logger.info("  日勤 index 3: %d名", len(day_index_3_group))
+        logger.info("  夜勤 index 1: %d名", len(night_index_1_group))
+        logger.info("  夜勤 index 2: %d名", len(night_index_2_group))
 
         return config
 
@@ -153,10 +162,10 @@ class ConfigGenerator:
             filename: ファイル名
         """
         filepath = self.output_dir / filename
-        logger.info(f"設定ファイル保存: {filepath}")
+        logger.info("設定ファイル保存: %s", filepath)
 
         with open(filepath, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
 
         logger.info("保存完了")
 
@@ -170,10 +179,10 @@ class ConfigGenerator:
         filepath = self.output_dir / filename
 
         if filepath.exists():
-            logger.info(f"NG日設定ファイルは既に存在します: {filepath}")
+            logger.info("NG日設定ファイルは既に存在します: %s", filepath)
             return
 
-        logger.info(f"NG日設定ファイル雛形作成: {filepath}")
+        logger.info("NG日設定ファイル雛形作成: %s", filepath)
 
         template = {
             'ng_dates': {
@@ -199,7 +208,7 @@ class ConfigGenerator:
         }
 
         with open(filepath, 'w', encoding='utf-8') as f:
-            yaml.dump(template, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            yaml.dump(template, f, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
 
         logger.info("雛形作成完了")
 
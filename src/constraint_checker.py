@@ -5,8 +5,11 @@
 各制約関数は (制約OK: bool, エラーメッセージ: str) のタプルを返します。
 """
 
+from bisect import bisect_right
 from datetime import date, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, FrozenSet, List, Tuple, Any, Optional
+
+from src.schedule_index import ScheduleIndex
 
 
 class ConstraintChecker:
@@ -32,6 +35,11 @@ class ConstraintChecker:
         self.min_days_day_index3 = constraints.get('interval', {}).get('min_days_between_same_person_day_index3', 7)
         self.night_to_day_gap = constraints.get('night_to_day_gap', {}).get('min_days', 7)
 
+        # メンバー別のNG日集合・期間NG索引（初回参照時に構築）
+        self._member_ng_dates: Dict[str, FrozenSet[date]] = {}
+        self._period_index: Dict[str, Tuple[List[date], List[date], List[Tuple[date, int, date, str]]]] = {}
+        self._matsuda_reference_date: Optional[date] = None
+
         # メンバー個別設定のマップを作成
         self.member_configs = {}
         if 'members' in settings:
@@ -42,8 +50,9 @@ class ConstraintChecker:
                 for member in group_list:
                     # 既存の設定があればマージ（後勝ち、または最初の設定を優先）
                     # ここでは単純に上書きしますが、通常同じメンバーの設定は同期されている前提
+                    # settingsの辞書は呼び出し側と共有されるため、コピーしてからマージする
                     if member['name'] not in self.member_configs:
-                        self.member_configs[member['name']] = member
+                        self.member_configs[member['name']] = dict(member)
                     else:
                         # 既存の設定に属性を追加（例: interval設定が片方にしかない場合など）
                         self.member_configs[member['name']].update(member)
@@ -55,19 +64,85 @@ class ConstraintChecker:
                 extract_configs(m['night_shift'].get('index_1_group', []))
                 extract_configs(m['night_shift'].get('index_2_group', []))
 
+        # 個別の最小間隔は初期化時に整数化しておき、チェック時は1回の参照で済ませる
+        self._member_min_days_day: Dict[str, int] = {
+            name: int(config['min_days_day'])
+            for name, config in self.member_configs.items()
+            if config.get('min_days_day') is not None
+        }
+        self._member_min_days_night: Dict[str, int] = {
+            name: int(config['min_days_night'])
+            for name, config in self.member_configs.items()
+            if config.get('min_days_night') is not None
+        }
+
     def _get_member_min_days_day(self, member: str) -> int:
         """メンバーごとの日勤最小間隔を取得（設定がなければデフォルト）"""
-        if member in self.member_configs:
-             val = self.member_configs[member].get('min_days_day')
-             if val is not None: return int(val)
-        return self.min_days_day
+        return self._member_min_days_day.get(member, self.min_days_day)
 
     def _get_member_min_days_night(self, member: str) -> int:
         """メンバーごとの夜勤最小間隔を取得（設定がなければデフォルト）"""
-        if member in self.member_configs:
-             val = self.member_configs[member].get('min_days_night')
-             if val is not None: return int(val)
-        return self.min_days_night
+        return self._member_min_days_night.get(member, self.min_days_night)
+
+    def _get_member_ng_dates(self, member: str) -> FrozenSet[date]:
+        """メンバー別NG日を日付の集合として取得"""
+        ng_dates = self._member_ng_dates.get(member)
+        if ng_dates is None:
+            by_member = self.ng_dates_config.get('ng_dates', {}).get('by_member', {})
+            ng_dates = frozenset(
+                date.fromisoformat(ng_date_str)
+                for ng_date_str in by_member.get(member, [])
+            )
+            self._member_ng_dates[member] = ng_dates
+        return ng_dates
+
+    def _get_period_index(
+        self,
+        member: str
+    ) -> Tuple[List[date], List[date], List[Tuple[date, int, date, str]]]:
+        """
+        メンバーの期間NGを開始日順に並べた索引を取得
+
+        Returns:
+            (開始日リスト, 終了日の累積最大リスト, (開始日, 記載順, 終了日, 理由) のリスト)
+        """
+        index = self._period_index.get(member)
+        if index is None:
+            by_period = self.ng_dates_config.get('ng_dates', {}).get('by_period', {})
+            entries = sorted(
+                (
+                    date.fromisoformat(period['start']),
+                    order,
+                    date.fromisoformat(period['end']),
+                    period.get('reason', '期間NG')
+                )
+                for order, period in enumerate(by_period.get(member, []))
+            )
+            starts = [entry[0] for entry in entries]
+            max_ends = []
+            for entry in entries:
+                max_ends.append(max(max_ends[-1], entry[2]) if max_ends else entry[2])
+            index = (starts, max_ends, entries)
+            self._period_index[member] = index
+        return index
+
+    def _find_ng_period_reason(self, member: str, target_date: date) -> Optional[str]:
+        """
+        target_dateを含む期間NGの理由を取得（該当なしはNone）
+
+        開始日で二分探索し、それ以前に始まる期間のどれも届かなければ即座に終了します。
+        複数の期間が該当する場合は、ng_dates.yamlでの記載順が最初のものを返します。
+        """
+        starts, max_ends, entries = self._get_period_index(member)
+        count = bisect_right(starts, target_date)
+        if count == 0 or max_ends[count - 1] < target_date:
+            return None
+
+        matched = min(
+            (entry for entry in entries[:count] if entry[2] >= target_date),
+            key=lambda entry: entry[1]
+        )
+        return matched[3]
 
     def check_day_index_constraint(
         self,
@@ -96,7 +171,7 @@ class ConstraintChecker:
         past_indexes = member_stats[member].get('day_indexes', [])
 
         # index 1,2経験者がindex 3に配置される場合
-        if target_index == 3 and any(i in [1, 2] for i in past_indexes):
+        if target_index == 3 and (1 in past_indexes or 2 in past_indexes):
             return False, f"{member}は過去にindex 1,2を経験しているため、index 3に配置不可"
 
         # index 3経験者がindex 1,2に配置される場合
@@ -164,35 +239,35 @@ class ConstraintChecker:
         Returns:
             (制約OK, エラーメッセージ)
         """
-        day_schedule = current_schedule.get('day', {})
-        night_schedule = current_schedule.get('night', {})
+        return self._check_overlap_indexed(
+            member, target_date, shift_type, ScheduleIndex.from_schedule(current_schedule)
+        )
 
+    def _check_overlap_indexed(
+        self,
+        member: str,
+        target_date: date,
+        shift_type: str,
+        schedule_index: ScheduleIndex
+    ) -> Tuple[bool, str]:
+        """重複禁止制約をインデックスでチェック（check_overlap_constraintの本体）"""
         if shift_type == 'day':
             # ケース1: 日勤を配置しようとしている
-            # -> その日が、既存の夜勤週（期間）に含まれていないかチェック
-            for week_start, night_indexes in night_schedule.items():
+            # -> その日が、本人の既存の夜勤週（期間）に含まれていないかチェック
+            for week_start in schedule_index.get_dates(member, 'night'):
                 week_end = week_start + timedelta(days=6)
-                
-                # ターゲット日が夜勤期間に含まれる場合
                 if week_start <= target_date <= week_end:
-                    # その夜勤週に本人がアサインされているか確認
-                    for night_idx, night_member in night_indexes.items():
-                        if night_member == member:
-                            return False, f"{member}は{week_start}～{week_end}に夜勤配置済み、{target_date}に日勤は不可"
+                    return False, f"{member}は{week_start}～{week_end}に夜勤配置済み、{target_date}に日勤は不可"
 
         elif shift_type == 'night':
             # ケース2: 夜勤を配置しようとしている
-            # -> その週（期間）の中に、既に日勤が入っていないかチェック
+            # -> その週（期間）の中に、本人の日勤が既に入っていないかチェック
             week_start = target_date
             week_end = week_start + timedelta(days=6)
 
-            for day_date, day_indexes in day_schedule.items():
-                # 日勤日が今回の夜勤期間に含まれる場合
+            for day_date in schedule_index.get_dates(member, 'day'):
                 if week_start <= day_date <= week_end:
-                    # その日勤日に本人がアサインされているか確認
-                    for day_idx, day_member in day_indexes.items():
-                        if day_member == member:
-                            return False, f"{member}は{day_date}に日勤配置済み、{week_start}～{week_end}に夜勤は不可"
+                    return False, f"{member}は{day_date}に日勤配置済み、{week_start}～{week_end}に夜勤は不可"
 
         return True, ""
 
@@ -218,17 +293,25 @@ class ConstraintChecker:
         Returns:
             (制約OK, エラーメッセージ)
         """
-        night_schedule = current_schedule.get('night', {})
+        return self._check_night_to_day_gap_indexed(
+            member, target_date, ScheduleIndex.from_schedule(current_schedule), member_stats
+        )
 
-        for week_start, indexes in night_schedule.items():
-            for idx, assigned_member in indexes.items():
-                if assigned_member == member:
-                    # 夜勤終了日（日曜日）
-                    night_end = week_start + timedelta(days=6)
-                    days_since = (target_date - night_end).days
+    def _check_night_to_day_gap_indexed(
+        self,
+        member: str,
+        target_date: date,
+        schedule_index: ScheduleIndex,
+        member_stats: Dict = None
+    ) -> Tuple[bool, str]:
+        """夜勤→日勤ギャップ制約をインデックスでチェック（check_night_to_day_gapの本体）"""
+        for week_start in schedule_index.get_dates(member, 'night'):
+            # 夜勤終了日（日曜日）
+            night_end = week_start + timedelta(days=6)
+            days_since = (target_date - night_end).days
 
-                    if 0 < days_since < self.night_to_day_gap:
-                        return False, f"{member}は{night_end}に夜勤終了、{self.night_to_day_gap}日間は日勤不可（あと{self.night_to_day_gap - days_since}日必要）"
+            if 0 < days_since < self.night_to_day_gap:
+                return False, f"{member}は{night_end}に夜勤終了、{self.night_to_day_gap}日間は日勤不可（あと{self.night_to_day_gap - days_since}日必要）"
 
         # 過去データからもチェック（オプション）
         if member_stats and member in member_stats:
@@ -265,20 +348,23 @@ class ConstraintChecker:
         Returns:
             (制約OK, エラーメッセージ)
         """
-        day_schedule = current_schedule.get('day', {})
+        return self._check_min_interval_day_indexed(
+            member, target_date, target_index, ScheduleIndex.from_schedule(current_schedule)
+        )
 
+    def _check_min_interval_day_indexed(
+        self,
+        member: str,
+        target_date: date,
+        target_index: int,
+        schedule_index: ScheduleIndex
+    ) -> Tuple[bool, str]:
+        """日勤最小間隔制約をインデックスでチェック（check_min_interval_dayの本体）"""
         # index 3は代休があるため制約を緩和、それ以外は設定値(個別設定優先)
         min_days = self.min_days_day_index3 if target_index == 3 else self._get_member_min_days_day(member)
 
         # 現在のスケジュールから最終日勤日を取得
-        last_day_date = None
-        for day_date, indexes in sorted(day_schedule.items(), reverse=True):
-            for idx, assigned_member in indexes.items():
-                if assigned_member == member:
-                    last_day_date = day_date
-                    break
-            if last_day_date:
-                break
+        last_day_date = schedule_index.get_last(member, 'day')
 
         if last_day_date:
             days_since = (target_date - last_day_date).days
@@ -309,20 +395,22 @@ class ConstraintChecker:
         Returns:
             (制約OK, エラーメッセージ)
         """
-        night_schedule = current_schedule.get('night', {})
-        
+        return self._check_min_interval_night_indexed(
+            member, target_week_start, ScheduleIndex.from_schedule(current_schedule)
+        )
+
+    def _check_min_interval_night_indexed(
+        self,
+        member: str,
+        target_week_start: date,
+        schedule_index: ScheduleIndex
+    ) -> Tuple[bool, str]:
+        """夜勤最小間隔制約をインデックスでチェック（check_min_interval_nightの本体）"""
         # 個別設定優先
         min_days = self._get_member_min_days_night(member)
 
         # 現在のスケジュールから最終夜勤週を取得
-        last_night_week = None
-        for week_start, indexes in sorted(night_schedule.items(), reverse=True):
-            for idx, assigned_member in indexes.items():
-                if assigned_member == member:
-                    last_night_week = week_start
-                    break
-            if last_night_week:
-                break
+        last_night_week = schedule_index.get_last(member, 'night')
 
         if last_night_week:
             days_since = (target_week_start - last_night_week).days
@@ -351,30 +439,32 @@ class ConstraintChecker:
         Returns:
             (制約OK, エラーメッセージ)
         """
-        ng_dates = self.ng_dates_config.get('ng_dates', {})
-
         # グローバルNG日はスケジュール構築側で枠自体の有無として判定するため、
         # ここでは個人のNGチェックのみ行います。
 
         # メンバー別NG日
-        by_member = ng_dates.get('by_member', {})
-        member_ng_dates = by_member.get(member, [])
-        for ng_date_str in member_ng_dates:
-            if target_date == date.fromisoformat(ng_date_str):
-                return False, f"{member}は{target_date}がNG日"
+        if target_date in self._get_member_ng_dates(member):
+            return False, f"{member}は{target_date}がNG日"
 
         # 期間指定NG日
-        by_period = ng_dates.get('by_period', {})
-        member_periods = by_period.get(member, [])
-        for period in member_periods:
-            start = date.fromisoformat(period['start'])
-            end = date.fromisoformat(period['end'])
-            if start <= target_date <= end:
-                reason = period.get('reason', '期間NG')
-                return False, f"{member}は{target_date}がNG期間({reason})"
+        reason = self._find_ng_period_reason(member, target_date)
+        if reason is not None:
+            return False, f"{member}は{target_date}がNG期間({reason})"
 
         return True, ""
 
+    def _get_matsuda_reference_date(self) -> date:
+        """settings.yamlの松田さん基準日を取得（初回のみ解析）"""
+        if self._matsuda_reference_date is None:
+            matsuda_config = self.settings.get('matsuda_schedule', {})
+            ref_str = matsuda_config.get('reference_date')
+            if ref_str:
+                self._matsuda_reference_date = date.fromisoformat(ref_str)
+            else:
+                # デフォルト基準日
+                self._matsuda_reference_date = date(2025, 2, 20)
+        return self._matsuda_reference_date
+
     def check_matsuda_biweekly(
         self,
         target_week_start: date,
@@ -395,13 +485,7 @@ class ConstraintChecker:
             松田さんを配置すべき週かどうか
         """
         if reference_date is None:
-            matsuda_config = self.settings.get('matsuda_schedule', {})
-            ref_str = matsuda_config.get('reference_date')
-            if ref_str:
-                reference_date = date.fromisoformat(ref_str)
-            else:
-                # デフォルト基準日
-                reference_date = date(2025, 2, 20)
+            reference_date = self._get_matsuda_reference_date()
 
         # 基準日からの週数を計算
         weeks_diff = (target_week_start - reference_date).days // 7
@@ -416,7 +500,9 @@ class ConstraintChecker:
         shift_type: str,  # 'day' or 'night'
         target_index: int,
         current_schedule: Dict,
-        member_stats: Dict
+        member_stats: Dict,
+        schedule_index: Optional[ScheduleIndex] = None,
+        stop_at_first: bool = False
     ) -> Tuple[bool, List[str]]:
         """
         すべての制約を一括チェック
@@ -428,10 +514,15 @@ class ConstraintChecker:
             target_index: 配置予定のindex
             current_schedule: 現在のスケジュール
             member_stats: メンバー統計情報
+            schedule_index: current_scheduleのインデックス（省略時はここで構築）
+            stop_at_first: Trueの場合、最初の違反で残りのチェックを省略
 
         Returns:
             (すべての制約OK, エラーメッセージリスト)
         """
+        if schedule_index is None:
+            schedule_index = ScheduleIndex.from_schedule(current_schedule)
+
         errors = []
 
         # 1. Index制約
@@ -439,31 +530,43 @@ class ConstraintChecker:
             ok, msg = self.check_day_index_constraint(member, target_index, member_stats)
             if not ok:
                 errors.append(msg)
+                if stop_at_first:
+                    return False, errors
         else:
             ok, msg = self.check_night_index_constraint(member, target_index, member_stats)
             if not ok:
                 errors.append(msg)
+                if stop_at_first:
+                    return False, errors
 
         # 2. 重複禁止
-        ok, msg = self.check_overlap_constraint(member, target_date, shift_type, current_schedule)
+        ok, msg = self._check_overlap_indexed(member, target_date, shift_type, schedule_index)
         if not ok:
             errors.append(msg)
+            if stop_at_first:
+                return False, errors
 
         # 3. 夜勤→日勤ギャップ（日勤配置時のみ）
         if shift_type == 'day':
-            ok, msg = self.check_night_to_day_gap(member, target_date, current_schedule, member_stats)
+            ok, msg = self._check_night_to_day_gap_indexed(member, target_date, schedule_index, member_stats)
             if not ok:
                 errors.append(msg)
+                if stop_at_first:
+                    return False, errors
 
         # 4. 最小間隔
         if shift_type == 'day':
-            ok, msg = self.check_min_interval_day(member, target_date, target_index, current_schedule, member_stats)
+            ok, msg = self._check_min_interval_day_indexed(member, target_date, target_index, schedule_index)
             if not ok:
                 errors.append(msg)
+                if stop_at_first:
+                    return False, errors
         else:
-            ok, msg = self.check_min_interval_night(member, target_date, current_schedule, member_stats)
+            ok, msg = self._check_min_interval_night_indexed(member, target_date, schedule_index)
             if not ok:
                 errors.append(msg)
+                if stop_at_first:
+                    return False, errors
 
         # 5. NG日
         ok, msg = self.check_ng_dates(member, target_date)
@@ -471,3 +574,42 @@ class ConstraintChecker:
             errors.append(msg)
 
         return len(errors) == 0, errors
+
+    def validate_candidates(
+        self,
+        candidates: List[str],
+        target_date: date,
+        shift_type: str,
+        target_index: int,
+        current_schedule: Dict,
+        member_stats: Dict,
+        schedule_index: Optional[ScheduleIndex] = None,
+        stop_at_first: bool = False
+    ) -> List[Tuple[bool, List[str]]]:
+        """
+        同じ枠の候補者全員をまとめてチェック
+
+        スケジュールのインデックスを1回だけ用意し、全候補者で共有します。
+
+        Args:
+            candidates: 候補者リスト
+            target_date: 配置予定日（日勤の場合）または週開始日（夜勤の場合）
+            shift_type: 'day' または 'night'
+            target_index: 配置予定のindex
+            current_schedule: 現在のスケジュール
+            member_stats: メンバー統計情報
+            schedule_index: current_scheduleのインデックス（省略時はここで構築）
+            stop_at_first: Trueの場合、候補者ごとに最初の違反で残りのチェックを省略
+
+        Returns:
+            候補者と同じ順の (すべての制約OK, エラーメッセージリスト) のリスト
+        """
+        if schedule_index is None:
+            schedule_index = ScheduleIndex.from_schedule(current_schedule)
+        return [
+            self.validate_all_constraints(
+                candidate, target_date, shift_type, target_index,
+                current_schedule, member_stats, schedule_index, stop_at_first
+            )
+            for candidate in candidates
+        ]
@@ -114,44 +114,59 @@ class DutyRosterLoader:
         """
         logger.info("メンバー履歴分析開始")
 
+        # メンバー単位・勤務区分単位の集計をgroupbyでまとめて計算する
+        grouped = df.groupby('person_name', sort=False)
+        first_dates = grouped['date'].min()
+        last_dates = grouped['date'].max()
+
+        day_df = df[df['shift_category'] == 'Day']
+        day_grouped = day_df.groupby('person_name')
+        day_counts = day_grouped.size()
+        day_indexes = day_grouped['shift_index'].unique()
+
+        night_df = df[df['shift_category'] == 'Night']
+        night_indexes = night_df.groupby('person_name')['shift_index'].unique()
+        night_counts = self._count_night_sets(night_df)
+
         stats = {}
-        for member in df['person_name'].unique():
-            member_data = df[df['person_name'] == member]
-
-            # 日勤データ
-            day_data = member_data[member_data['shift_category'] == 'Day']
-            
-            # 夜勤データ（週単位でユニークな開始日をカウント）
-            night_data = member_data[member_data['shift_category'] == 'Night']
-            
-            # 夜勤回数の計算：連続する7日間は1回とみなす
-            # 週の開始日（月曜日）でグループ化してカウントするのが確実
-            # ここでは簡易的に、日付順にソートして、前の日付と7日以上空いていれば新しい回としてカウントする
-            night_count = 0
-            if not night_data.empty:
-                sorted_dates = sorted(night_data['date'].unique())
-                if sorted_dates:
-                    night_count = 1
-                    last_date = sorted_dates[0]
-                    for current_date in sorted_dates[1:]:
-                        # 2日以上空いていれば別の回とみなす（通常は7日連続なので、翌日は差が1日）
-                        if (current_date - last_date).days > 1:
-                             night_count += 1
-                        last_date = current_date
+        # first_datesのindexはgroupby(sort=False)により出現順
+        for member in first_dates.index:
+            day_count = int(day_counts.get(member, 0))
+            night_count = int(night_counts.get(member, 0))
 
             stats[member] = {
-                'total_count': len(day_data) + night_count,
-                'day_count': len(day_data),
+                'total_count': day_count + night_count,
+                'day_count': day_count,
                 'night_count': night_count,
-                'day_indexes': sorted(day_data['shift_index'].unique().tolist()) if len(day_data) > 0 else [],
-                'night_indexes': sorted(night_data['shift_index'].unique().tolist()) if len(night_data) > 0 else [],
-                'last_date': member_data['date'].max().date(),
-                'first_date': member_data['date'].min().date()
+                'day_indexes': sorted(day_indexes[member].tolist()) if member in day_indexes.index else [],
+                'night_indexes': sorted(night_indexes[member].tolist()) if member in night_indexes.index else [],
+                'last_date': last_dates[member].date(),
+                'first_date': first_dates[member].date()
             }
 
         logger.info(f"分析完了: {len(stats)}名")
         return stats
 
+    @staticmethod
+    def _count_night_sets(night_df: pd.DataFrame) -> pd.Series:
+        """
+        メンバーごとの夜勤回数を計算（連続する夜勤日は1回とみなす）
+
+        Args:
+            night_df: 夜勤行のみのDataFrame
+
+        Returns:
+            メンバー名をindexとする夜勤回数のSeries
+        """
+        # 日付順に並べ、メンバーごとに前の夜勤日と2日以上空いていれば新しい回としてカウントする
+        # （通常は7日連続なので、翌日は差が1日。各メンバーの最初の夜勤日も1回目として数える）
+        # 同じ日の重複行は差が0日となり新しい回にならないため、重複除去は不要
+        night_dates = night_df[['person_name', 'date']].sort_values('date', kind='stable')
+        names = night_dates['person_name']
+        gaps = night_dates.groupby(names)['date'].diff()
+        starts_new_set = gaps.isna() | (gaps.dt.days > 1)
+        return starts_new_set.groupby(names).sum()
+
     def get_active_members(self, df: pd.DataFrame, months: int = 2) -> List[str]:
         """
         アクティブなメンバーを取得（直近N ヶ月に出現したメンバー）
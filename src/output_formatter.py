@@ -5,9 +5,9 @@
 """
 
 import pandas as pd
+from collections import Counter
 from datetime import date, timedelta
 from typing import Dict, List, Any
-from tabulate import tabulate
 
 
 class OutputFormatter:
@@ -50,6 +50,24 @@ class OutputFormatter:
 
         return "\n".join(output)
 
+    @staticmethod
+    def _render_table(table_data: List[List[Any]], headers: List[str]) -> str:
+        """
+        表をtabulateのsimple形式で描画
+
+        tabulateはCLI表示でしか使わないため、Web起動時に読み込まないよう
+        ここで初めてimportします。
+
+        Args:
+            table_data: 行データ
+            headers: ヘッダー
+
+        Returns:
+            テーブル文字列
+        """
+        from tabulate import tabulate
+        return tabulate(table_data, headers=headers, tablefmt='simple')
+
     def _format_day_schedule_table(self, day_schedule: Dict) -> str:
         """
         日勤スケジュールをテーブル形式でフォーマット
@@ -82,7 +100,7 @@ class OutputFormatter:
 
         headers = ['日付', '曜日', 'Index 1', 'Index 2', 'Index 3']
 
-        return tabulate(table_data, headers=headers, tablefmt='simple')
+        return self._render_table(table_data, headers)
 
     def _format_night_schedule_table(self, night_schedule: Dict) -> str:
         """
@@ -114,7 +132,7 @@ class OutputFormatter:
 
         headers = ['週（月曜開始）', '期間', 'Index 1', 'Index 2']
 
-        return tabulate(table_data, headers=headers, tablefmt='simple')
+        return self._render_table(table_data, headers)
 
     def generate_statistics(
         self,
@@ -133,24 +151,21 @@ class OutputFormatter:
         """
         stats = {}
 
-        # メンバー別担当回数を集計
-        member_counts = {}
-
-        # 日勤カウント
-        day_schedule = schedule.get('day', {})
-        for day_date, indexes in day_schedule.items():
-            for idx, member in indexes.items():
-                if member not in member_counts:
-                    member_counts[member] = {'day': 0, 'night': 0}
-                member_counts[member]['day'] += 1
-
-        # 夜勤カウント
-        night_schedule = schedule.get('night', {})
-        for week_start, indexes in night_schedule.items():
-            for idx, member in indexes.items():
-                if member not in member_counts:
-                    member_counts[member] = {'day': 0, 'night': 0}
-                member_counts[member]['night'] += 1
+        # メンバー別担当回数を集計（日勤→夜勤の初出順）
+        day_counts = Counter(
+            member
+            for indexes in schedule.get('day', {}).values()
+            for member in indexes.values()
+        )
+        night_counts = Counter(
+            member
+            for indexes in schedule.get('night', {}).values()
+            for member in indexes.values()
+        )
+        member_counts = {
+            member: {'day': day_counts[member], 'night': night_counts[member]}
+            for member in (*day_counts, *(m for m in night_counts if m not in day_counts))
+        }
 
         stats['member_counts'] = member_counts
 
@@ -164,9 +179,10 @@ class OutputFormatter:
 
         # 公平性指標の計算
         if total_counts:
-            max_count = max(total_counts.values())
-            min_count = min(total_counts.values())
-            avg_count = sum(total_counts.values()) / len(total_counts)
+            totals = total_counts.values()
+            max_count = max(totals)
+            min_count = min(totals)
+            avg_count = sum(totals) / len(totals)
 
             if min_count > 0:
                 fairness_ratio = (max_count - min_count) / min_count
@@ -213,7 +229,7 @@ class OutputFormatter:
                 table_data.append(row)
 
             headers = ['メンバー', '日勤', '夜勤', '合計']
-            output.append(tabulate(table_data, headers=headers, tablefmt='simple'))
+            output.append(self._render_table(table_data, headers))
 
         # 公平性指標
         fairness = statistics.get('fairness', {})
@@ -259,32 +275,30 @@ class OutputFormatter:
         Returns:
             date, shift_category, shift_index, person_name を持つDataFrame
         """
-        records = []
-
-        day_schedule = schedule.get('day', {})
-        for day_date, indexes in day_schedule.items():
-            for idx, member in indexes.items():
-                records.append({
-                    'date': str(day_date),
-                    'shift_category': 'Day',
-                    'shift_index': int(idx),
-                    'person_name': member
-                })
-
-        night_schedule = schedule.get('night', {})
-        for week_start, indexes in night_schedule.items():
-            for idx, member in indexes.items():
-                records.append({
-                    'date': str(week_start),
-                    'shift_category': 'Night',
-                    'shift_index': int(idx),
-                    'person_name': member
-                })
-
-        df = pd.DataFrame(
-            records,
-            columns=['date', 'shift_category', 'shift_index', 'person_name']
-        )
+        # 列ごとのリストに直接詰め、行ごとの辞書生成と型推論を避ける
+        dates: List[str] = []
+        categories: List[str] = []
+        shift_indexes: List[int] = []
+        names: List[str] = []
+
+        for shift_type, category in (('day', 'Day'), ('night', 'Night')):
+            for target_date, indexes in schedule.get(shift_type, {}).items():
+                date_str = str(target_date)
+                for idx, member in indexes.items():
+                    dates.append(date_str)
+                    categories.append(category)
+                    shift_indexes.append(int(idx))
+                    names.append(member)
+
+        df = pd.DataFrame({
+            'date': dates,
+            'shift_category': categories,
+            'shift_index': shift_indexes,
+            'person_name': names
+        })
+        if df.empty:
+            # 空の場合も従来どおり全列object型にそろえる
+            df = df.astype(object)
 
         if not df.empty:
             df = df.sort_values(['date', 'shift_category', 'shift_index', 'person_name'])
@@ -1,6 +1,8 @@
 
+from collections import Counter
 from datetime import date, timedelta
-from typing import Dict, List, Any, Optional
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple
 
 class ScheduleAnalyzer:
     """
@@ -37,23 +39,32 @@ class ScheduleAnalyzer:
         day_schedule = self.schedule.get('day', {})
         night_schedule = self.schedule.get('night', {})
 
+        # Position of each day date in the schedule (keeps the original report order)
+        day_positions = {d_date: pos for pos, d_date in enumerate(day_schedule)}
+
         # Iterate through Night shifts (by week)
         for night_start, night_assigns in night_schedule.items():
-            night_end = night_start + timedelta(days=6)
-            
+            # Look up only the 7 days of this week instead of scanning every day shift
+            week_days = [
+                d_date for d_date in (night_start + timedelta(days=i) for i in range(7))
+                if d_date in day_positions
+            ]
+            if not week_days:
+                continue
+            week_days.sort(key=day_positions.__getitem__)
+
             # Check each member in this night shift
             for n_idx, n_member in night_assigns.items():
-                
+
                 # Check Day shifts within this week
-                for d_date, d_assigns in day_schedule.items():
-                    if night_start <= d_date <= night_end:
-                        for d_idx, d_member in d_assigns.items():
-                            if n_member == d_member:
-                                self.analysis_result["overlaps"].append({
-                                    "member": n_member,
-                                    "date": d_date,
-                                    "details": f"Night (Week of {night_start}) & Day ({d_date})"
-                                })
+                for d_date in week_days:
+                    for d_idx, d_member in day_schedule[d_date].items():
+                        if n_member == d_member:
+                            self.analysis_result["overlaps"].append({
+                                "member": n_member,
+                                "date": d_date,
+                                "details": f"Night (Week of {night_start}) & Day ({d_date})"
+                            })
 
     def _check_close_intervals(self, threshold_days=7):
         """
@@ -64,83 +75,79 @@ class ScheduleAnalyzer:
         - Night to Day
         - Night to Night
         """
-        # 1. Collect all assignments per member
-        # Format: {'start': date, 'end': date, 'type': 'day'|'night'}
-        member_assignments = {}
+        # 1. Collect all assignments into one event list
+        # Format: (start: date, end: date, type: 'day'|'night', member: str)
+        # The "日勤(...)" / "夜勤(...週)" labels are only built for flagged pairs
+        events = []
+        # Per-member results, keyed in first-appearance order (day shifts first)
+        intervals_by_member: Dict[str, List[Dict[str, Any]]] = {}
 
         # Collect Day assignments
         for d_date, assigns in self.schedule.get('day', {}).items():
             for idx, member in assigns.items():
-                if member not in member_assignments:
-                    member_assignments[member] = []
-                member_assignments[member].append({
-                    'start': d_date,
-                    'end': d_date,
-                    'type': 'day',
-                    'desc': f"日勤({d_date})"
-                })
+                intervals_by_member.setdefault(member, [])
+                events.append((d_date, d_date, 'day', member))
 
         # Collect Night assignments
         for n_start, assigns in self.schedule.get('night', {}).items():
             n_end = n_start + timedelta(days=6)
             for idx, member in assigns.items():
-                if member not in member_assignments:
-                    member_assignments[member] = []
-                member_assignments[member].append({
-                    'start': n_start,
-                    'end': n_end,
-                    'type': 'night',
-                    'desc': f"夜勤({n_start}週)"
+                intervals_by_member.setdefault(member, [])
+                events.append((n_start, n_end, 'night', member))
+
+        # 2. Sort once by start (stable, so each member keeps the per-member order)
+        # and compare every event with that member's previous one
+        events.sort(key=itemgetter(0))
+        last_by_member: Dict[str, Tuple[date, date, str, str]] = {}
+
+        for event in events:
+            member = event[3]
+            current = last_by_member.get(member)
+            last_by_member[member] = event
+            if current is None:
+                continue
+
+            # Gap calculation: Next Start - Current End
+            # Day shift end is same as start, so Sat -> Sun gives gap 1.
+            # "Within 7 days" means 0 < gap <= threshold_days; gap <= 0 is an
+            # overlap or same-day case, which the overlap check reports instead.
+            gap = (event[0] - current[1]).days
+
+            if 0 < gap <= threshold_days:
+                intervals_by_member[member].append({
+                    "member": member,
+                    "gap": gap,
+                    "from": self._describe_assignment(current),
+                    "to": self._describe_assignment(event)
                 })
 
-        # 2. Sort and check intervals
-        for member, assignments in member_assignments.items():
-            # Sort by start date
-            assignments.sort(key=lambda x: x['start'])
-            
-            for i in range(len(assignments) - 1):
-                current = assignments[i]
-                next_assign = assignments[i+1]
-                
-                # Gap calculation: Next Start - Current End
-                gap = (next_assign['start'] - current['end']).days
-                
-                # Since day shift end is same as start, gap 1 means consecutive days (e.g. Sat -> Sun)
-                # gap > 0 means there is at least 1 day in between? 
-                # e.g. Sat (End Sat) -> Sun (Start Sun). Sun - Sat = 1. Gap is 1 day (0 days in between).
-                # User asks for "within 7 days" (assuming interval < 7)
-                
-                # Logic: If I work on 1st, and next is 8th. 8-1 = 7. Gap is 7.
-                # If "within 7 days" means gap < 7 (i.e. 1..6 days apart)
-                
-                if 0 < gap <= threshold_days:
-                     self.analysis_result["close_intervals"].append({
-                        "member": member,
-                        "gap": gap,
-                        "from": current['desc'],
-                        "to": next_assign['desc']
-                    })
-                elif gap <= 0:
-                     # This is effectively an overlap or consecutive/same day which might be caught by overlap check
-                     # But for Day-Day consecutive (Sat/Sun), it's common but maybe worth noting if user wants strict checks.
-                     # However, user specifically asked for "Overlap Day/Night".
-                     # Close interval usually implies "too close".
-                     pass
+        for intervals in intervals_by_member.values():
+            self.analysis_result["close_intervals"].extend(intervals)
+
+    @staticmethod
+    def _describe_assignment(event: Tuple[date, date, str, str]) -> str:
+        """Label of an assignment event for the close-interval report"""
+        start, _, shift_type, _ = event
+        if shift_type == 'day':
+            return f"日勤({start})"
+        return f"夜勤({start}週)"
 
     def _calculate_counts(self):
         """
         Calculate total counts for each member (Past + New)
         """
         counts = {}
-        
-        # Initialize with known members from stats or schedule
-        all_members = set(self.member_stats.keys())
-        
-        # Add members from current schedule
-        for s_type in ['day', 'night']:
-            for date_key, assigns in self.schedule.get(s_type, {}).items():
-                for member in assigns.values():
-                    all_members.add(member)
+
+        # New counts: one pass per shift type
+        day_counts = Counter(
+            m for assigns in self.schedule.get('day', {}).values() for m in assigns.values()
+        )
+        night_counts = Counter(
+            m for assigns in self.schedule.get('night', {}).values() for m in assigns.values()
+        )
+
+        # Known members from stats or schedule
+        all_members = self.member_stats.keys() | day_counts.keys() | night_counts.keys()
 
         for member in all_members:
             # Past counts
@@ -149,23 +156,10 @@ class ScheduleAnalyzer:
             if member in self.member_stats:
                 past_day = self.member_stats[member].get('day_count', 0)
                 past_night = self.member_stats[member].get('night_count', 0)
-            
-            # New counts
-            new_day = 0
-            new_night = 0
-            
-            # Count Day
-            for assigns in self.schedule.get('day', {}).values():
-                for m in assigns.values():
-                    if m == member:
-                        new_day += 1
-            
-            # Count Night
-            for assigns in self.schedule.get('night', {}).values():
-                for m in assigns.values():
-                    if m == member:
-                        new_night += 1
-            
+
+            new_day = day_counts[member]
+            new_night = night_counts[member]
+
             counts[member] = {
                 "total_day": past_day + new_day,
                 "total_night": past_night + new_night,
@@ -174,7 +168,7 @@ class ScheduleAnalyzer:
                 "past_day": past_day,
                 "past_night": past_night
             }
-            
+
         # Convert to list for easy template iteration
         result_list = []
         for member, stats in counts.items():
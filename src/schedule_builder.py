@@ -8,14 +8,24 @@
 import hashlib
 import yaml
 from datetime import date, timedelta
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, FrozenSet, List, Sequence, Tuple, Any, Optional, Union
 from utils.logger import setup_logger
 from utils.date_utils import get_weekends_in_period, get_mondays_in_period
 from src.constraint_checker import ConstraintChecker
+from src.schedule_index import ScheduleIndex
 
 
+# libyamlが使える環境ではC実装のローダーを使用（読み込み結果は同じ）
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = setup_logger(__name__, 'INFO')
 
+# member_statsの過去担当回数キー（スコア計算のたびに文字列を組み立てない）
+_PAST_COUNT_KEYS = {'day': 'day_count', 'night': 'night_count'}
+
 
 class ScheduleBuilder:
     """
@@ -24,60 +34,55 @@ class ScheduleBuilder:
 
     def __init__(
         self,
-        settings_path: str,
-        ng_dates_path: str,
+        settings_path: Union[str, Dict],
+        ng_dates_path: Union[str, Dict],
         member_stats: Dict,
         recent_df=None,
         variant_index: int = 0,
-        variant_top_k: int = 1
+        variant_top_k: int = 1,
+        rank_cache: Optional[Dict] = None
     ):
         """
         初期化
 
         Args:
-            settings_path: settings.yamlのパス
-            ng_dates_path: ng_dates.yamlのパス
+            settings_path: settings.yamlのパス（読み込み済みの設定辞書も可）
+            ng_dates_path: ng_dates.yamlのパス（読み込み済みの設定辞書も可）
             member_stats: メンバー統計情報
             recent_df: 直近データのDataFrame（オプション）
+            rank_cache: 候補順位のキャッシュ辞書（オプション）。
+                同じ設定・同じ統計情報のバリアント間でのみ共有すること
         """
-        # 設定読み込み
-        with open(settings_path, 'r', encoding='utf-8') as f:
-            self.settings = yaml.safe_load(f)
-
-        with open(ng_dates_path, 'r', encoding='utf-8') as f:
-            self.ng_dates_config = yaml.safe_load(f)
+        # 設定読み込み（辞書が渡された場合は再パースしない。内容は変更しない）
+        self.settings = self._load_config(settings_path)
+        self.ng_dates_config = self._load_config(ng_dates_path)
 
         self.member_stats = member_stats
         self.recent_df = recent_df
         self.variant_index = max(0, int(variant_index))
         self.variant_top_k = max(1, int(variant_top_k))
+        self.rank_cache = rank_cache
+        self._schedule: Optional[Dict] = None
+        self._schedule_index = ScheduleIndex()
+        self._assignment_log: List[Tuple[str, date, int, str]] = []
         self.baseline_past_counts = self._calculate_baseline_past_counts()
         self.baseline_last_date = self._calculate_baseline_last_date()
 
         # 制約チェッカー初期化
         self.checker = ConstraintChecker(self.settings, self.ng_dates_config)
 
-        # メンバーグループ取得
+        # Global NG日（会社休日）は日勤・夜勤の両方で使うため一度だけ解析
+        self.global_ng_dates = self._parse_global_ng_dates(self.ng_dates_config)
+
+        # メンバーグループ取得（候補者リストとして読み取り専用で渡すためtuple）
         members = self.settings.get('members', {})
         day_shift = members.get('day_shift', {})
         night_shift = members.get('night_shift', {})
 
-        self.day_index_1_2_group = [
-            m['name'] for m in day_shift.get('index_1_2_group', [])
-            if m.get('active', True)
-        ]
-        self.day_index_3_group = [
-            m['name'] for m in day_shift.get('index_3_group', [])
-            if m.get('active', True)
-        ]
-        self.night_index_1_group = [
-            m['name'] for m in night_shift.get('index_1_group', [])
-            if m.get('active', True)
-        ]
-        self.night_index_2_group = [
-            m['name'] for m in night_shift.get('index_2_group', [])
-            if m.get('active', True)
-        ]
+        self.day_index_1_2_group = self._active_names(day_shift.get('index_1_2_group', []))
+        self.day_index_3_group = self._active_names(day_shift.get('index_3_group', []))
+        self.night_index_1_group = self._active_names(night_shift.get('index_1_group', []))
+        self.night_index_2_group = self._active_names(night_shift.get('index_2_group', []))
 
         # 松田さんの設定
         self.matsuda_config = self.settings.get('matsuda_schedule', {})
@@ -87,16 +92,65 @@ class ScheduleBuilder:
                 self.matsuda_config.get('reference_date', '2025-02-20')
             )
 
-        logger.info(f"スケジュール構築初期化完了")
-        logger.info(f"日勤 index 1,2: {len(self.day_index_1_2_group)}名")
-        logger.info(f"日勤 index 3: {len(self.day_index_3_group)}名")
-        logger.info(f"夜勤 index 1: {len(self.night_index_1_group)}名")
-        logger.info(f"夜勤 index 2: {len(self.night_index_2_group)}名")
+            # 松田さんを配置できない週の代替候補
+            self._night_index_2_without_matsuda = tuple(
+                m for m in self.night_index_2_group if m != '松田'
+            )
+
+        logger.info("スケジュール構築初期化完了")
+        logger.info("日勤 index 1,2: %d名", len(self.day_index_1_2_group))
+        logger.info("日勤 index 3: %d名", len(self.day_index_3_group))
+        logger.info("夜勤 index 1: %d名", len(self.night_index_1_group))
+        logger.info("夜勤 index 2: %d名", len(self.night_index_2_group))
         if self.variant_index > 0 and self.variant_top_k > 1:
             logger.info(
-                f"バリアント設定: index={self.variant_index}, top_k={self.variant_top_k}"
+                "バリアント設定: index=%d, top_k=%d", self.variant_index, self.variant_top_k
             )
 
+    @staticmethod
+    def _active_names(group: List[Dict]) -> Tuple[str, ...]:
+        """グループ設定から有効（active）なメンバー名を設定順に取得"""
+        return tuple(m['name'] for m in group if m.get('active', True))
+
+    @staticmethod
+    def _load_config(source: Union[str, Dict]) -> Dict:
+        """
+        YAML設定を読み込む
+
+        Args:
+            source: YAMLファイルのパス、または読み込み済みの設定辞書
+
+        Returns:
+            設定辞書
+        """
+        if isinstance(source, dict):
+            return source
+        with open(source, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=_YamlLoader)
+
+    @staticmethod
+    def _parse_global_ng_dates(ng_dates_config: Dict) -> FrozenSet[date]:
+        """
+        Global NG日（会社休日）を日付の集合として取得
+
+        Args:
+            ng_dates_config: ng_dates.yamlの内容
+
+        Returns:
+            Global NG日の集合（解析できない日付は無視）
+        """
+        global_ng_dates = set()
+        ng_dates = ng_dates_config.get('ng_dates', {})
+        if ng_dates:
+            global_ng_list = ng_dates.get('global', [])
+            if global_ng_list:
+                for d_str in global_ng_list:
+                    try:
+                        global_ng_dates.add(date.fromisoformat(d_str))
+                    except ValueError:
+                        pass
+        return frozenset(global_ng_dates)
+
     def _calculate_baseline_past_counts(self) -> Dict[str, float]:
         """
         新規メンバー用の基準回数（平均）を算出
@@ -157,12 +211,15 @@ class ScheduleBuilder:
         Returns:
             スケジュール辞書
         """
-        logger.info(f"スケジュール構築開始: {start_date} ～ {end_date}")
+        logger.info("スケジュール構築開始: %s ～ %s", start_date, end_date)
 
         schedule = {
             'day': {},
             'night': {}
         }
+        self._schedule = schedule
+        self._schedule_index = ScheduleIndex()
+        self._assignment_log = []
 
         # 夜勤スケジュール生成（先に実行）
         self._assign_night_shifts(schedule, start_date, end_date)
@@ -170,7 +227,7 @@ class ScheduleBuilder:
         # 日勤スケジュール生成
         self._assign_day_shifts(schedule, start_date, end_date)
 
-        logger.info(f"スケジュール構築完了")
+        logger.info("スケジュール構築完了")
         return schedule
 
     def _assign_day_shifts(
@@ -188,24 +245,12 @@ class ScheduleBuilder:
             end_date: 終了日
         """
         weekends = get_weekends_in_period(start_date, end_date)
-        logger.info(f"日勤対象日数: {len(weekends)}日")
-
-        # Global NG日（会社休日）を取得
-        global_ng_dates = set()
-        ng_dates = self.ng_dates_config.get('ng_dates', {})
-        if ng_dates:
-            global_ng_list = ng_dates.get('global', [])
-            if global_ng_list:
-                for d_str in global_ng_list:
-                    try:
-                        global_ng_dates.add(date.fromisoformat(d_str))
-                    except ValueError:
-                        pass
+        logger.info("日勤対象日数: %d日", len(weekends))
 
         for weekend_date in weekends:
             # 会社休日（Global NG）の場合はスキップ
-            if weekend_date in global_ng_dates:
-                logger.info(f"会社休日（Global NG）のため、{weekend_date}の日勤割り当てをスキップします")
+            if weekend_date in self.global_ng_dates:
+                logger.info("会社休日（Global NG）のため、%sの日勤割り当てをスキップします", weekend_date)
                 continue
 
             schedule['day'][weekend_date] = {}
@@ -214,9 +259,9 @@ class ScheduleBuilder:
             for index in [1, 2, 3]:
                 # 候補者グループを取得
                 if index in [1, 2]:
-                    candidates = self.day_index_1_2_group.copy()
+                    candidates = self.day_index_1_2_group
                 else:
-                    candidates = self.day_index_3_group.copy()
+                    candidates = self.day_index_3_group
 
                 # 最適な候補を選択
                 selected = self._select_best_candidate(
@@ -233,8 +278,8 @@ class ScheduleBuilder:
                         weekend_date, 'day', index, candidates, schedule
                     )
 
-                schedule['day'][weekend_date][index] = selected
-                logger.debug(f"日勤: {weekend_date} Index {index} → {selected}")
+                self._record_assignment(schedule, 'day', weekend_date, index, selected)
+                logger.debug("日勤: %s Index %s → %s", weekend_date, index, selected)
 
     def _assign_night_shifts(
         self,
@@ -251,37 +296,23 @@ class ScheduleBuilder:
             end_date: 終了日
         """
         mondays = get_mondays_in_period(start_date, end_date)
-        logger.info(f"夜勤対象週数: {len(mondays)}週")
-
-        # Global NG日（会社休日）を取得
-        global_ng_dates = set()
-        ng_dates = self.ng_dates_config.get('ng_dates', {})
-        if ng_dates:
-            global_ng_list = ng_dates.get('global', [])
-            if global_ng_list:
-                for d_str in global_ng_list:
-                    try:
-                        global_ng_dates.add(date.fromisoformat(d_str))
-                    except ValueError:
-                        pass
+        logger.info("夜勤対象週数: %d週", len(mondays))
 
         for monday in mondays:
             # 週の平日（月～金）がすべてGlobal NGかチェック
-            is_full_holiday_week = True
-            for i in range(5):  # 0(Mon) to 4(Fri)
-                check_date = monday + timedelta(days=i)
-                if check_date not in global_ng_dates:
-                    is_full_holiday_week = False
-                    break
-            
+            is_full_holiday_week = all(
+                monday + timedelta(days=i) in self.global_ng_dates
+                for i in range(5)  # 0(Mon) to 4(Fri)
+            )
+
             if is_full_holiday_week:
-                logger.info(f"平日全休（Global NG）のため、{monday}週の夜勤割り当てをスキップします")
+                logger.info("平日全休（Global NG）のため、%s週の夜勤割り当てをスキップします", monday)
                 continue
 
             schedule['night'][monday] = {}
 
             # Index 1 を割り当て
-            candidates = self.night_index_1_group.copy()
+            candidates = self.night_index_1_group
             selected = self._select_best_candidate(
                 candidates,
                 monday,
@@ -295,8 +326,8 @@ class ScheduleBuilder:
                     monday, 'night', 1, candidates, schedule
                 )
 
-            schedule['night'][monday][1] = selected
-            logger.debug(f"夜勤: {monday} Index 1 → {selected}")
+            self._record_assignment(schedule, 'night', monday, 1, selected)
+            logger.debug("夜勤: %s Index 1 → %s", monday, selected)
 
             # Index 2 を割り当て（松田さん優先）
             if self.matsuda_enabled and self.checker.check_matsuda_biweekly(monday, self.matsuda_reference_date):
@@ -304,15 +335,16 @@ class ScheduleBuilder:
                 matsuda_name = '松田'
                 # 制約チェック
                 ok, errors = self.checker.validate_all_constraints(
-                    matsuda_name, monday, 'night', 2, schedule, self.member_stats
+                    matsuda_name, monday, 'night', 2, schedule, self.member_stats,
+                    self._get_schedule_index(schedule)
                 )
                 if ok:
-                    schedule['night'][monday][2] = matsuda_name
-                    logger.debug(f"夜勤: {monday} Index 2 → {matsuda_name} (固定)")
+                    self._record_assignment(schedule, 'night', monday, 2, matsuda_name)
+                    logger.debug("夜勤: %s Index 2 → %s (固定)", monday, matsuda_name)
                 else:
-                    logger.warning(f"松田さんを{monday}に配置できません: {errors}")
+                    logger.warning("松田さんを%sに配置できません: %s", monday, errors)
                     # 他の候補を探す
-                    candidates = [m for m in self.night_index_2_group if m != matsuda_name]
+                    candidates = self._night_index_2_without_matsuda
                     selected = self._select_best_candidate(
                         candidates, monday, 'night', 2, schedule
                     )
@@ -320,11 +352,11 @@ class ScheduleBuilder:
                         self._raise_no_candidate_error(
                             monday, 'night', 2, candidates, schedule
                         )
-                    schedule['night'][monday][2] = selected
-                    logger.debug(f"夜勤: {monday} Index 2 → {selected} (松田さん代替)")
+                    self._record_assignment(schedule, 'night', monday, 2, selected)
+                    logger.debug("夜勤: %s Index 2 → %s (松田さん代替)", monday, selected)
             else:
                 # 松田さん以外の週
-                candidates = self.night_index_2_group.copy()
+                candidates = self.night_index_2_group
                 selected = self._select_best_candidate(
                     candidates, monday, 'night', 2, schedule
                 )
@@ -332,12 +364,45 @@ class ScheduleBuilder:
                     self._raise_no_candidate_error(
                         monday, 'night', 2, candidates, schedule
                     )
-                schedule['night'][monday][2] = selected
-                logger.debug(f"夜勤: {monday} Index 2 → {selected}")
+                self._record_assignment(schedule, 'night', monday, 2, selected)
+                logger.debug("夜勤: %s Index 2 → %s", monday, selected)
+
+    def _record_assignment(
+        self,
+        schedule: Dict,
+        shift_type: str,
+        target_date: date,
+        index: int,
+        member: str
+    ) -> None:
+        """
+        スケジュールに担当者を書き込み、割り当て履歴に記録
+
+        Args:
+            schedule: スケジュール辞書（更新される）
+            shift_type: 'day' or 'night'
+            target_date: 日勤日または夜勤週の月曜日
+            index: index番号
+            member: メンバー名
+        """
+        schedule[shift_type][target_date][index] = member
+        self._schedule_index.add(shift_type, target_date, member)
+        self._assignment_log.append((shift_type, target_date, index, member))
+
+    def _get_schedule_index(self, current_schedule: Dict) -> Optional[ScheduleIndex]:
+        """
+        current_scheduleのインデックスを取得
+
+        構築中のスケジュールなら割り当てごとに更新しているインデックスを返し、
+        それ以外（外部から渡された辞書）はNoneを返して制約チェック側で構築させます。
+        """
+        if current_schedule is self._schedule:
+            return self._schedule_index
+        return None
 
     def _select_best_candidate(
         self,
-        candidates: List[str],
+        candidates: Sequence[str],
         target_date: date,
         shift_type: str,
         index: int,
@@ -356,36 +421,82 @@ class ScheduleBuilder:
         Returns:
             選択されたメンバー名（候補がいない場合はNone）
         """
-        valid_candidates = []
+        ranked = self._rank_candidates(
+            candidates, target_date, shift_type, index, current_schedule
+        )
+
+        if not ranked:
+            return None
+
+        # スコアが最も高い候補を選択（バリアント指定時は上位k内で決定）
+        if self.variant_index == 0 or self.variant_top_k <= 1:
+            return ranked[0][0]
+
+        k = min(self.variant_top_k, len(ranked))
+        pick_index = self._variant_pick_index(target_date, shift_type, index, k)
+        return ranked[pick_index][0]
+
+    def _rank_candidates(
+        self,
+        candidates: Sequence[str],
+        target_date: date,
+        shift_type: str,
+        index: int,
+        current_schedule: Dict
+    ) -> Tuple[Tuple[str, float], ...]:
+        """
+        制約を満たす候補者をスコア降順に並べる（同点は候補順）
+
+        構築中のスケジュールに対する順位は、それまでの割り当て履歴だけで決まるため、
+        rank_cacheが指定されていれば履歴をキーにバリアント間で結果を共有します。
 
-        for candidate in candidates:
-            # 制約チェック
-            ok, errors = self.checker.validate_all_constraints(
-                candidate, target_date, shift_type, index,
-                current_schedule, self.member_stats
+        Args:
+            candidates: 候補者リスト
+            target_date: 配置予定日
+            shift_type: 'day' or 'night'
+            index: index番号
+            current_schedule: 現在のスケジュール
+
+        Returns:
+            (メンバー名, スコア) のタプル
+        """
+        cache_key = None
+        if self.rank_cache is not None and current_schedule is self._schedule:
+            cache_key = (
+                target_date, shift_type, index,
+                tuple(candidates), tuple(self._assignment_log)
             )
+            cached = self.rank_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        valid_candidates = []
+
+        # 制約チェック（枠ごとに候補者全員をまとめて判定、違反理由はログ用に最初の1件のみ）
+        results = self.checker.validate_candidates(
+            candidates, target_date, shift_type, index,
+            current_schedule, self.member_stats,
+            self._get_schedule_index(current_schedule),
+            stop_at_first=True
+        )
 
+        for candidate, (ok, errors) in zip(candidates, results):
             if ok:
                 # 優先度スコア計算
                 score = self._calculate_priority_score(
                     candidate, shift_type, current_schedule, target_date
                 )
                 valid_candidates.append((candidate, score))
-                logger.debug(f"  候補: {candidate} (スコア: {score:.3f})")
+                logger.debug("  候補: %s (スコア: %.3f)", candidate, score)
             else:
-                logger.debug(f"  候補: {candidate} → 制約違反: {errors[0] if errors else '不明'}")
+                logger.debug("  候補: %s → 制約違反: %s", candidate, errors[0] if errors else '不明')
 
-        if not valid_candidates:
-            return None
-
-        # スコアが最も高い候補を選択（バリアント指定時は上位k内で決定）
         valid_candidates.sort(key=lambda x: x[1], reverse=True)
-        if self.variant_index == 0 or self.variant_top_k <= 1:
-            return valid_candidates[0][0]
+        ranked = tuple(valid_candidates)
 
-        k = min(self.variant_top_k, len(valid_candidates))
-        pick_index = self._variant_pick_index(target_date, shift_type, index, k)
-        return valid_candidates[pick_index][0]
+        if cache_key is not None:
+            self.rank_cache[cache_key] = ranked
+        return ranked
 
     def _variant_pick_index(
         self,
@@ -448,12 +559,12 @@ class ScheduleBuilder:
             score += 1.0 * 0.3  # 未担当は最大スコア
 
         # 3. 過去の担当頻度（少ないほど高スコア）
-        if member in self.member_stats:
-            past_count = self.member_stats[member].get(f'{shift_type}_count', 0)
-            score += (1.0 / (past_count + 1)) * 0.2
+        stats = self.member_stats.get(member)
+        if stats is not None:
+            past_count = stats.get(_PAST_COUNT_KEYS[shift_type], 0)
         else:
             past_count = self.baseline_past_counts.get(shift_type, 0.0)
-            score += (1.0 / (past_count + 1)) * 0.2
+        score += (1.0 / (past_count + 1)) * 0.2
 
         # 4. ソフト制約：日勤直後の夜勤を避ける
         if shift_type == 'night':
@@ -479,6 +590,11 @@ class ScheduleBuilder:
         Returns:
             担当回数
         """
+        # 構築中のスケジュールはインデックスの担当日数がそのまま担当回数
+        schedule_index = self._get_schedule_index(current_schedule)
+        if schedule_index is not None:
+            return len(schedule_index.get_dates(member, shift_type))
+
         count = 0
         schedule = current_schedule.get(shift_type, {})
 
@@ -506,16 +622,21 @@ class ScheduleBuilder:
         Returns:
             最終担当日（担当がない場合はNone）
         """
-        schedule = current_schedule.get(shift_type, {})
-        last_date = None
-
-        for date_or_week, indexes in sorted(schedule.items(), reverse=True):
-            for idx, assigned_member in indexes.items():
-                if assigned_member == member:
-                    last_date = date_or_week
+        schedule_index = self._get_schedule_index(current_schedule)
+        if schedule_index is not None:
+            # 構築中のスケジュールは割り当て時に更新している最終担当日を参照
+            last_date = schedule_index.get_last(member, shift_type)
+        else:
+            schedule = current_schedule.get(shift_type, {})
+            last_date = None
+
+            for date_or_week, indexes in sorted(schedule.items(), reverse=True):
+                for idx, assigned_member in indexes.items():
+                    if assigned_member == member:
+                        last_date = date_or_week
+                        break
+                if last_date:
                     break
-            if last_date:
-                break
 
         # 過去データからも確認
         if last_date is None and member in self.member_stats:
@@ -555,25 +676,32 @@ class ScheduleBuilder:
         penalty_strong = day_to_night_config.get('penalty_strong', 0.3)
         penalty_weak = day_to_night_config.get('penalty_weak', 0.15)
 
-        # 日勤スケジュールを取得
-        day_schedule = current_schedule.get('day', {})
+        # 本人の日勤日を取得（構築中のスケジュールはインデックスから）
+        schedule_index = self._get_schedule_index(current_schedule)
+        if schedule_index is not None:
+            member_day_dates = schedule_index.get_dates(member, 'day')
+        else:
+            member_day_dates = [
+                day_date
+                for day_date, day_indexes in current_schedule.get('day', {}).items()
+                for assigned_member in day_indexes.values()
+                if assigned_member == member
+            ]
 
         penalty = 0.0
 
         # 夜勤週の前後を確認（前週の日勤が影響する可能性がある）
-        for day_date, day_indexes in day_schedule.items():
-            for idx, assigned_member in day_indexes.items():
-                if assigned_member == member:
-                    # 日勤日から夜勤開始日までの日数を計算
-                    days_between = (night_week_start - day_date).days
-
-                    # 日数に応じてペナルティを設定
-                    if 0 < days_between <= days_threshold_strong:
-                        # 強いペナルティ（3日以内など）
-                        penalty = max(penalty, penalty_strong)
-                    elif days_between <= days_threshold_weak:
-                        # 弱いペナルティ（4～7日など）
-                        penalty = max(penalty, penalty_weak)
+        for day_date in member_day_dates:
+            # 日勤日から夜勤開始日までの日数を計算
+            days_between = (night_week_start - day_date).days
+
+            # 日数に応じてペナルティを設定
+            if 0 < days_between <= days_threshold_strong:
+                # 強いペナルティ（3日以内など）
+                penalty = max(penalty, penalty_strong)
+            elif days_between <= days_threshold_weak:
+                # 弱いペナルティ（4～7日など）
+                penalty = max(penalty, penalty_weak)
 
         return penalty
 
@@ -582,7 +710,7 @@ class ScheduleBuilder:
         target_date: date,
         shift_type: str,
         index: int,
-        candidates: List[str],
+        candidates: Sequence[str],
         current_schedule: Dict
     ) -> None:
         """
@@ -602,14 +730,15 @@ class ScheduleBuilder:
         error_msg = f"\nエラー: {target_date}（{weekday}）{shift_name} Index {index} に割り当て可能な候補者がいません。\n"
         error_msg += f"\n【制約チェック結果】\n"
 
-        for candidate in candidates[:5]:  # 上位5名のみ表示
-            error_msg += f"\n候補者: {candidate}\n"
+        shown_candidates = candidates[:5]  # 上位5名のみ表示
+        results = self.checker.validate_candidates(
+            shown_candidates, target_date, shift_type, index,
+            current_schedule, self.member_stats,
+            self._get_schedule_index(current_schedule)
+        )
 
-            # 各制約をチェック
-            ok, errors = self.checker.validate_all_constraints(
-                candidate, target_date, shift_type, index,
-                current_schedule, self.member_stats
-            )
+        for candidate, (ok, errors) in zip(shown_candidates, results):
+            error_msg += f"\n候補者: {candidate}\n"
 
             if ok:
                 error_msg += f"  ✓ すべての制約OK\n"
@@ -0,0 +1,72 @@
+"""
+スケジュールインデックスモジュール
+
+スケジュール辞書をメンバー別の担当日リストに逆引きします。
+制約チェックでスケジュール全体を候補者ごとに走査しないために使用します。
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+
+
+class ScheduleIndex:
+    """
+    メンバー → 担当日（日勤日 / 夜勤週の月曜日）の逆引きインデックス
+
+    各リストはスケジュール辞書の挿入順を保持します。
+    """
+
+    def __init__(self):
+        """初期化"""
+        self.day_dates: Dict[str, List[date]] = {}
+        self.night_weeks: Dict[str, List[date]] = {}
+        # 最終担当日は登録時に更新し、参照をO(1)にする
+        self.last_day: Dict[str, date] = {}
+        self.last_night: Dict[str, date] = {}
+
+    @classmethod
+    def from_schedule(cls, schedule: Dict) -> 'ScheduleIndex':
+        """
+        スケジュール辞書からインデックスを構築
+
+        Args:
+            schedule: {'day': {...}, 'night': {...}} 形式のスケジュール
+
+        Returns:
+            ScheduleIndex
+        """
+        index = cls()
+        for shift_type in ('day', 'night'):
+            for target_date, indexes in schedule.get(shift_type, {}).items():
+                for member in indexes.values():
+                    index.add(shift_type, target_date, member)
+        return index
+
+    def add(self, shift_type: str, target_date: date, member: str) -> None:
+        """
+        担当を1件登録
+
+        Args:
+            shift_type: 'day' または 'night'
+            target_date: 日勤日または夜勤週の月曜日
+            member: メンバー名
+        """
+        if shift_type == 'day':
+            bucket, last = self.day_dates, self.last_day
+        else:
+            bucket, last = self.night_weeks, self.last_night
+        bucket.setdefault(member, []).append(target_date)
+
+        current_last = last.get(member)
+        if current_last is None or target_date > current_last:
+            last[member] = target_date
+
+    def get_dates(self, member: str, shift_type: str) -> List[date]:
+        """メンバーの担当日リストを取得（担当なしは空リスト）"""
+        bucket = self.day_dates if shift_type == 'day' else self.night_weeks
+        return bucket.get(member, [])
+
+    def get_last(self, member: str, shift_type: str) -> Optional[date]:
+        """メンバーの最終担当日を取得（担当なしはNone）"""
+        last = self.last_day if shift_type == 'day' else self.last_night
+        return last.get(member)
@@ -0,0 +1,14 @@
+"""
+テスト共通フィクスチャ
+"""
+import pytest
+from src.data_loader import load_and_process_data
+
+
+@pytest.fixture(scope="session")
+def processed_roster():
+    """同梱の当番CSVを処理した (全データ, 直近データ, メンバー統計)（セッション内で1回だけ読み込む）"""
+    return load_and_process_data(
+        "data/duty_roster_2021_2025.csv",
+        lookback_months=2
+    )
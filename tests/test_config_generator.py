@@ -5,7 +5,13 @@ import pytest
 import yaml
 from pathlib import Path
 from src.config_generator import ConfigGenerator, auto_generate_config
-from src.data_loader import load_and_process_data
+
+
+@pytest.fixture
+def member_stats(processed_roster):
+    """テスト用メンバー統計データ"""
+    _, _, stats = processed_roster
+    return stats
 
 
 class TestConfigGenerator:
@@ -16,15 +22,6 @@ class TestConfigGenerator:
         """テスト用ジェネレーターインスタンス（一時ディレクトリ使用）"""
         return ConfigGenerator(output_dir=str(tmp_path))
 
-    @pytest.fixture
-    def member_stats(self):
-        """テスト用メンバー統計データ"""
-        _, _, stats = load_and_process_data(
-            "data/duty_roster_2021_2025.csv",
-            lookback_months=2
-        )
-        return stats
-
     def test_generate_settings_from_history(self, generator, member_stats):
         """過去データからの設定生成テスト"""
         config = generator.generate_settings_from_history(member_stats)
@@ -300,6 +300,37 @@ def test_check_min_interval_night_insufficient_days(checker, member_stats):
     assert '最小21日必要' in msg
 
 
+def test_member_min_interval_override(sample_settings, sample_ng_dates):
+    """メンバー個別の最小間隔が優先され、settingsの辞書は変更されない"""
+    sample_settings['members'] = {
+        'day_shift': {
+            'index_1_2_group': [{'name': '丸岡', 'min_days_day': 10}],
+        },
+        'night_shift': {
+            'index_1_group': [{'name': '丸岡', 'min_days_night': '28'}],
+        },
+    }
+    checker = ConstraintChecker(sample_settings, sample_ng_dates)
+    current_schedule = {
+        'day': {date(2025, 3, 1): {1: '丸岡', 2: '今井'}},
+        'night': {date(2025, 3, 3): {1: '丸岡', 2: '松田'}}
+    }
+
+    ok, _ = checker.check_min_interval_day('丸岡', date(2025, 3, 12), 1, current_schedule, {})
+    assert ok is True
+    ok, msg = checker.check_min_interval_night('丸岡', date(2025, 3, 24), current_schedule, {})
+    assert ok is False
+    assert '最小28日必要' in msg
+    # 他メンバーは全体設定のまま
+    ok, msg = checker.check_min_interval_day('今井', date(2025, 3, 12), 1, current_schedule, {})
+    assert ok is False
+    assert '最小14日必要' in msg
+
+    assert sample_settings['members']['day_shift']['index_1_2_group'][0] == {
+        'name': '丸岡', 'min_days_day': 10
+    }
+
+
 # =============================================================================
 # NG日制約テスト
 # =============================================================================
@@ -329,6 +360,33 @@ def test_check_ng_dates_by_period(checker):
     assert '夏季休暇' in msg
 
 
+def test_check_ng_dates_by_period_overlapping(sample_settings):
+    """重なる期間NG → 記載順で最初に該当する期間の理由を返す"""
+    ng_dates = {
+        'ng_dates': {
+            'by_period': {
+                '大関': [
+                    {'start': '2025-08-12', 'end': '2025-08-14', 'reason': 'B'},
+                    {'start': '2025-08-01', 'end': '2025-08-31', 'reason': 'A'},
+                    {'start': '2025-09-10', 'end': '2025-09-12', 'reason': 'C'}
+                ]
+            }
+        }
+    }
+    checker = ConstraintChecker(sample_settings, ng_dates)
+
+    ok, msg = checker.check_ng_dates('大関', date(2025, 8, 13))
+    assert ok is False
+    assert '(B)' in msg
+
+    ok, msg = checker.check_ng_dates('大関', date(2025, 8, 20))
+    assert ok is False
+    assert '(A)' in msg
+
+    ok, msg = checker.check_ng_dates('大関', date(2025, 9, 5))
+    assert ok is True
+
+
 def test_check_ng_dates_ok(checker):
     """NG日に該当しない → OK"""
     target_date = date(2025, 3, 30)
@@ -399,3 +457,47 @@ def test_validate_all_constraints_multiple_violations(checker, member_stats):
     )
     assert ok is False
     assert len(errors) >= 1  # index制約違反
+
+
+def test_validate_candidates_matches_individual_checks(checker, member_stats):
+    """候補者一括チェック → 個別チェックと同じ結果を候補順で返す"""
+    current_schedule = {
+        'day': {
+            date(2025, 3, 22): {1: '丸岡', 2: '今井', 3: '大関'}
+        },
+        'night': {
+            date(2025, 3, 24): {1: '宮本', 2: '松田'}
+        }
+    }
+    candidates = ['丸岡', '今井', '宮本', '新人']
+    results = checker.validate_candidates(
+        candidates, date(2025, 3, 29), 'day', 1, current_schedule, member_stats
+    )
+    expected = [
+        checker.validate_all_constraints(
+            candidate, date(2025, 3, 29), 'day', 1, current_schedule, member_stats
+        )
+        for candidate in candidates
+    ]
+    assert results == expected
+    assert results[3] == (True, [])
+    assert results[0][0] is False
+
+
+def test_validate_all_constraints_stop_at_first(checker, member_stats):
+    """stop_at_first=True → 最初の違反だけを返す"""
+    current_schedule = {
+        'day': {
+            date(2025, 3, 22): {1: '丸岡', 2: '今井', 3: '大関'}
+        },
+        'night': {}
+    }
+    # 丸岡: 前回日勤から3日（間隔違反）かつ3/25はNG日
+    args = ('丸岡', date(2025, 3, 25), 'day', 1, current_schedule, member_stats)
+    ok, errors = checker.validate_all_constraints(*args)
+    assert ok is False
+    assert len(errors) >= 2
+
+    ok_first, first_errors = checker.validate_all_constraints(*args, stop_at_first=True)
+    assert ok_first is False
+    assert first_errors == errors[:1]
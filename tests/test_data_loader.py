@@ -4,7 +4,7 @@ data_loader.pyのテスト
 import pytest
 import pandas as pd
 from datetime import date
-from src.data_loader import DutyRosterLoader, load_and_process_data
+from src.data_loader import DutyRosterLoader
 
 
 class TestDataLoader:
@@ -99,12 +99,9 @@ class TestDataLoader:
         # リストがソートされていること
         assert active_members == sorted(active_members)
 
-    def test_load_and_process_data(self):
+    def test_load_and_process_data(self, processed_roster):
         """統合処理のテスト"""
-        df_all, df_recent, member_stats = load_and_process_data(
-            "data/duty_roster_2021_2025.csv",
-            lookback_months=2
-        )
+        df_all, df_recent, member_stats = processed_roster
 
         # 全データが読み込まれていること
         assert len(df_all) > 0
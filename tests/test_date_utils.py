@@ -67,6 +67,17 @@ class TestDateUtils:
         assert date(2025, 3, 22) in weekends  # 土曜日
         assert date(2025, 3, 23) in weekends  # 日曜日
 
+    def test_get_weekends_in_period_partial_weekends(self):
+        """日曜開始・土曜終了の期間では端の1日だけを含む"""
+        start = date(2025, 3, 23)  # 日曜日
+        end = date(2025, 3, 29)    # 土曜日
+
+        weekends = get_weekends_in_period(start, end)
+
+        assert weekends == [date(2025, 3, 23), date(2025, 3, 29)]
+        assert get_weekends_in_period(end, start) == []
+        assert get_mondays_in_period(date(2025, 3, 24), date(2025, 3, 24)) == [date(2025, 3, 24)]
+
     def test_is_weekend(self):
         """土日判定のテスト"""
         # 土曜日
@@ -0,0 +1,66 @@
+"""
+file_utils.pyのテスト
+"""
+import pytest
+
+from utils.file_utils import replace_with_backup
+
+
+def test_replace_with_backup_keeps_previous_content(tmp_path):
+    """置き換え後、直前の内容がバックアップに残ること"""
+    target = tmp_path / 'settings.yaml'
+    backup = tmp_path / 'settings.yaml.bak'
+    target.write_text('old', encoding='utf-8')
+    backup.write_text('older', encoding='utf-8')
+
+    replace_with_backup(target, backup, lambda p: p.write_text('new', encoding='utf-8'))
+
+    assert target.read_text(encoding='utf-8') == 'new'
+    assert backup.read_text(encoding='utf-8') == 'old'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['settings.yaml', 'settings.yaml.bak']
+
+
+def test_replace_with_backup_creates_new_file_without_backup(tmp_path):
+    """書き込み先がない場合は作成し、バックアップは作らないこと"""
+    target = tmp_path / 'nested' / 'history.csv'
+    backup = target.with_suffix('.bak')
+
+    replace_with_backup(target, backup, lambda p: p.write_text('a,b\n', encoding='utf-8'))
+
+    assert target.read_text(encoding='utf-8') == 'a,b\n'
+    assert not backup.exists()
+
+
+def test_replace_with_backup_leaves_target_intact_on_write_error(tmp_path):
+    """書き込みに失敗しても元のファイルとバックアップが変わらないこと"""
+    target = tmp_path / 'ng_dates.yaml'
+    backup = tmp_path / 'ng_dates.yaml.bak'
+    target.write_text('current', encoding='utf-8')
+
+    def failing_write(path):
+        path.write_text('partial', encoding='utf-8')
+        raise RuntimeError('disk full')
+
+    with pytest.raises(RuntimeError):
+        replace_with_backup(target, backup, failing_write)
+
+    assert target.read_text(encoding='utf-8') == 'current'
+    assert not backup.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['ng_dates.yaml']
+
+
+def test_replace_with_backup_overlapping_writers_use_separate_temp_files(tmp_path):
+    """書き込み中に別の置き換えが割り込んでも、双方が自分の内容で完了すること"""
+    target = tmp_path / 'history.csv'
+    backup = target.with_suffix('.bak')
+    target.write_text('v0', encoding='utf-8')
+
+    def outer_write(path):
+        path.write_text('outer', encoding='utf-8')
+        replace_with_backup(target, backup, lambda p: p.write_text('inner', encoding='utf-8'))
+
+    replace_with_backup(target, backup, outer_write)
+
+    assert target.read_text(encoding='utf-8') == 'outer'
+    assert backup.read_text(encoding='utf-8') == 'inner'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['history.bak', 'history.csv']
@@ -171,6 +171,20 @@ def test_schedule_builder_initialization(builder):
     assert len(builder.night_index_2_group) == 2
 
 
+def test_schedule_builder_accepts_loaded_config(temp_settings, temp_ng_dates, sample_member_stats):
+    """読み込み済みの設定辞書を渡しても、パス指定と同じ設定で初期化される"""
+    with open(temp_settings, 'r', encoding='utf-8') as f:
+        settings = yaml.safe_load(f)
+    with open(temp_ng_dates, 'r', encoding='utf-8') as f:
+        ng_dates = yaml.safe_load(f)
+
+    builder = ScheduleBuilder(settings, ng_dates, sample_member_stats)
+
+    assert builder.settings is settings
+    assert builder.ng_dates_config is ng_dates
+    assert len(builder.day_index_1_2_group) == 4
+
+
 def test_member_groups_loaded(builder):
     """メンバーグループが正しく読み込まれる"""
     assert '丸岡' in builder.day_index_1_2_group
@@ -256,6 +270,24 @@ def test_get_last_assignment_from_stats(builder):
     assert last_date == date(2025, 2, 10)
 
 
+def test_schedule_helpers_use_live_index(builder):
+    """構築中スケジュール（インデックス参照）と辞書走査で同じ結果になる"""
+    schedule = builder.build_schedule(date(2025, 3, 21), date(2025, 3, 27))
+    # 同内容の別辞書はインデックスを持たないため走査で計算される
+    copied = {shift: {d: dict(x) for d, x in schedule[shift].items()} for shift in ('day', 'night')}
+    night_week = date(2025, 3, 31)
+
+    members = {m for shift in copied.values() for x in shift.values() for m in x.values()}
+    for member in members | {'新人'}:
+        for shift_type in ('day', 'night'):
+            assert builder._count_in_schedule(member, shift_type, schedule) == \
+                builder._count_in_schedule(member, shift_type, copied)
+            assert builder._get_last_assignment(member, shift_type, schedule) == \
+                builder._get_last_assignment(member, shift_type, copied)
+        assert builder._calculate_day_to_night_penalty(member, night_week, schedule) == \
+            builder._calculate_day_to_night_penalty(member, night_week, copied)
+
+
 # =============================================================================
 # スケジュール構築テスト（小規模）
 # =============================================================================
@@ -295,6 +327,27 @@ def test_build_schedule_simple_week(builder):
         assert 2 in indexes
 
 
+def test_build_schedule_shared_rank_cache(temp_settings, temp_ng_dates, sample_member_stats):
+    """バリアント間で候補順位キャッシュを共有しても結果は変わらない"""
+    start_date = date(2025, 3, 21)
+    end_date = date(2025, 3, 27)
+    rank_cache = {}
+
+    for variant_index in range(3):
+        cached_builder = ScheduleBuilder(
+            temp_settings, temp_ng_dates, sample_member_stats,
+            variant_index=variant_index, variant_top_k=2, rank_cache=rank_cache
+        )
+        plain_builder = ScheduleBuilder(
+            temp_settings, temp_ng_dates, sample_member_stats,
+            variant_index=variant_index, variant_top_k=2
+        )
+        assert cached_builder.build_schedule(start_date, end_date) == \
+            plain_builder.build_schedule(start_date, end_date)
+
+    assert len(rank_cache) > 0
+
+
 @pytest.mark.skip(reason="テスト用メンバー数が少なく制約を満たせないためスキップ")
 def test_build_schedule_松田_biweekly_pattern(builder):
     """松田さんの隔週パターンが正しく機能する"""
@@ -0,0 +1,35 @@
+"""
+スケジュールインデックスのテスト
+"""
+
+from datetime import date
+from src.schedule_index import ScheduleIndex
+
+
+def test_from_schedule_collects_member_dates():
+    """スケジュール辞書からメンバー別の担当日を逆引きできる"""
+    schedule = {
+        'day': {
+            date(2025, 3, 22): {1: '丸岡', 2: '今井', 3: '大関'},
+            date(2025, 3, 23): {1: '今井', 2: '宮本', 3: '小久保'}
+        },
+        'night': {
+            date(2025, 3, 24): {1: '宮本', 2: '松田'}
+        }
+    }
+    index = ScheduleIndex.from_schedule(schedule)
+
+    assert index.get_dates('今井', 'day') == [date(2025, 3, 22), date(2025, 3, 23)]
+    assert index.get_dates('宮本', 'night') == [date(2025, 3, 24)]
+    assert index.get_dates('丸岡', 'night') == []
+
+
+def test_get_last_returns_latest_date_regardless_of_add_order():
+    """登録順に関係なく最も新しい担当日を返す"""
+    index = ScheduleIndex()
+    index.add('day', date(2025, 4, 5), '丸岡')
+    index.add('day', date(2025, 3, 22), '丸岡')
+
+    assert index.get_last('丸岡', 'day') == date(2025, 4, 5)
+    assert index.get_last('丸岡', 'night') is None
+    assert index.get_last('今井', 'day') is None
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from unittest.mock import patch
 
@@ -145,3 +146,44 @@ def test_upload_csv_accepts_multiple_files(client, tmp_path, monkeypatch):
     content = saved.read_text(encoding='utf-8-sig')
     assert 'A' in content
     assert 'B' in content
+
+
+def test_history_table_revalidates_with_etag(client, tmp_path, monkeypatch):
+    import web.services as svc
+
+    csv_path = tmp_path / 'hist.csv'
+    csv_path.write_text(
+        'date,shift_category,shift_index,person_name\n'
+        '2026-04-20,Day,1,A\n',
+        encoding='utf-8',
+    )
+    monkeypatch.setattr(svc, 'CSV_PATH', csv_path)
+
+    first = client.get('/history?page=1')
+    etag = first.headers['etag']
+    assert first.status_code == 200
+
+    cached = client.get('/history?page=1', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    csv_path.write_text(
+        'date,shift_category,shift_index,person_name\n'
+        '2026-04-20,Day,1,B\n'
+        '2026-04-19,Day,2,C\n',
+        encoding='utf-8',
+    )
+    changed = client.get('/history?page=1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
+
+    # 同じサイズの編集がmtimeの分解能内に収まっても、保存後は古い行を返さない
+    rows = svc.get_history_summary(page=1, page_size=50)['data']
+    assert svc.save_history_csv_page(1, 50, [dict(rows[0], person_name='E'), rows[1]])[0]
+    etag = client.get('/history?page=1').headers['etag']
+    stat = csv_path.stat()
+    assert svc.save_history_csv_page(1, 50, [dict(rows[0], person_name='D'), rows[1]])[0]
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert csv_path.stat().st_size == stat.st_size
+    edited = client.get('/history?page=1', headers={'If-None-Match': etag})
+    assert edited.status_code == 200
+    assert edited.headers['etag'] != etag
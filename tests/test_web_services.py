@@ -1,10 +1,16 @@
+import os
+import shutil
+import threading
 from datetime import date
 from io import BytesIO
+from pathlib import Path
 
 import pandas as pd
 
+import web.services as svc
 from src.history_csv import append_generated_schedule_to_history
-from web.services import import_history_csv_files, save_history_csv_page
+from src.output_formatter import OutputFormatter
+from web.services import _build_variant_result, import_history_csv_files, save_history_csv_page
 
 
 def build_sample_schedule():
@@ -98,6 +104,48 @@ def test_save_history_csv_page_edits_slice(tmp_path):
     assert csv_path.with_suffix('.bak').exists()
 
 
+def test_get_history_summary_reflects_page_edits(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'history_summary.csv'
+    monkeypatch.setattr(svc, 'CSV_PATH', csv_path)
+    append_generated_schedule_to_history(build_sample_schedule(), csv_path=csv_path)
+
+    first = svc.get_history_summary(page=1, page_size=2)
+    assert first['total_count'] == 5
+    rows = [dict(row, person_name=f'EDIT_{i}') for i, row in enumerate(first['data'])]
+
+    ok, _ = save_history_csv_page(1, 2, rows, csv_path=csv_path)
+    assert ok
+    edited = svc.get_history_summary(page=1, page_size=2)
+    assert [r['person_name'] for r in edited['data']] == ['EDIT_0', 'EDIT_1']
+
+
+def test_save_history_csv_page_keeps_both_overlapping_page_edits(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'history_concurrent.csv'
+    monkeypatch.setattr(svc, 'CSV_PATH', csv_path)
+    append_generated_schedule_to_history(build_sample_schedule(), csv_path=csv_path)
+    pages = {
+        page: [dict(row, person_name=f'P{page}_{i}') for i, row in
+               enumerate(svc.get_history_summary(page=page, page_size=2)['data'])]
+        for page in (1, 2)
+    }
+    start = threading.Barrier(2)
+    results = {}
+
+    def save(page):
+        start.wait()
+        results[page] = save_history_csv_page(page, 2, pages[page], csv_path=csv_path)
+
+    threads = [threading.Thread(target=save, args=(page,)) for page in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(ok for ok, _ in results.values())
+    names = [r['person_name'] for r in svc.get_history_summary(page=1, page_size=4)['data']]
+    assert names == ['P1_0', 'P1_1', 'P2_0', 'P2_1']
+
+
 def test_save_history_csv_page_rejects_night_index_three(tmp_path):
     csv_path = tmp_path / 'history_bad.csv'
     append_generated_schedule_to_history(build_sample_schedule(), csv_path=csv_path)
@@ -156,3 +204,189 @@ def test_import_history_csv_files_merges_multiple_files_and_deduplicates(tmp_pat
     assert result['row_count'] == 3
     assert len(df) == 3
     assert list(df['person_name']) == ['A', 'B', 'C']
+
+
+class _FixedScheduleBuilder:
+    def build_schedule(self, start_date, end_date):
+        return build_sample_schedule()
+
+
+def test_build_variant_result_reuses_summary_for_duplicate_schedule():
+    summary_cache = {}
+    ng_dates = {'global': [], 'by_member': {}, 'by_period': {}}
+    args = (date(2026, 3, 21), date(2026, 5, 20), {}, ng_dates, OutputFormatter(), summary_cache)
+
+    first = _build_variant_result(_FixedScheduleBuilder(), 0, *args)
+    second = _build_variant_result(_FixedScheduleBuilder(), 1, *args)
+
+    assert first['variant_index'] == 0
+    assert second['variant_index'] == 1
+    assert second['schedule'] == first['schedule']
+    assert second['schedule'] is not first['schedule']
+    assert second['analysis'] is first['analysis']
+    assert second['statistics'] is first['statistics']
+    assert len(summary_cache) == 1
+
+
+def test_load_ng_dates_cache_returns_copies_and_sees_writes(tmp_path, monkeypatch):
+    ng_path = tmp_path / 'ng_dates.yaml'
+    monkeypatch.setattr(svc, 'NG_DATES_PATH', ng_path)
+    svc.save_ng_dates({'global': ['2026-04-01'], 'by_member': {}, 'by_period': {}})
+
+    first = svc.load_ng_dates()
+    first['global'].append('2026-04-02')
+    assert svc.load_ng_dates()['global'] == ['2026-04-01']
+
+    updated = svc.add_global_ng_date('2026-04-03')
+    assert updated['global'] == ['2026-04-01', '2026-04-03']
+    assert svc.load_ng_dates()['global'] == ['2026-04-01', '2026-04-03']
+
+    ng_path.write_text('ng_dates:\n  global:\n  - 2026-05-05\n', encoding='utf-8')
+    assert svc.load_ng_dates()['global'] == [date(2026, 5, 5)]
+
+
+def test_save_ng_dates_primes_yaml_text_for_the_saved_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(svc, 'NG_DATES_PATH', tmp_path / 'ng_dates.yaml')
+    svc.save_ng_dates({'global': [], 'by_member': {}, 'by_period': {}})
+
+    svc.add_period_ng('山田', '2026-04-03', '2026-04-04', '出張')
+    assert svc._ng_dates_yaml_text is not None
+    primed = svc.get_ng_dates_yaml_text()
+
+    monkeypatch.setattr(svc, '_ng_dates_yaml_text', None)
+    assert primed == svc.get_ng_dates_yaml_text()
+
+
+def test_ng_date_mutators_skip_save_when_nothing_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(svc, 'NG_DATES_PATH', tmp_path / 'ng_dates.yaml')
+    svc.save_ng_dates({
+        'global': ['2026-04-01'],
+        'by_member': {'山田': ['2026-04-02']},
+        'by_period': {'山田': [{'start': '2026-04-03', 'end': '2026-04-04', 'reason': ''}]},
+    })
+    saved = []
+    monkeypatch.setattr(svc, 'save_ng_dates', saved.append)
+
+    svc.add_global_ng_date('2026-04-01')
+    svc.remove_global_ng_date('2026-04-09')
+    svc.add_member_ng_date('山田', '2026-04-02')
+    svc.remove_member_ng_date('山田', '2026-04-09')
+    svc.add_period_ng('山田', '2026-04-03', '2026-04-04', '')
+    result = svc.remove_period_ng('山田', '2026-04-09')
+
+    assert saved == []
+    assert len(result['by_period']['山田']) == 1
+
+    svc.remove_period_ng('山田', '2026-04-03')
+    assert len(saved) == 1
+    assert '山田' not in saved[0]['by_period']
+
+
+def test_bulk_apply_ng_dates_dedupes_and_saves_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(svc, 'NG_DATES_PATH', tmp_path / 'ng_dates.yaml')
+    svc.save_ng_dates({'global': [], 'by_member': {'山田': ['2026-04-02']}, 'by_period': {}})
+    saved = []
+    monkeypatch.setattr(svc, 'save_ng_dates', saved.append)
+
+    count = svc.bulk_apply_ng_dates([
+        {'matched_name': '山田', 'resolved_dates': ['2026-04-03', '2026-04-02', '2026-04-03']},
+        {'matched_name': '佐藤', 'resolved_dates': ['2026-04-01']},
+        {'matched_name': None, 'resolved_dates': ['2026-04-05']},
+    ])
+
+    assert count == 2
+    assert len(saved) == 1
+    assert saved[0]['by_member'] == {'山田': ['2026-04-02', '2026-04-03'], '佐藤': ['2026-04-01']}
+
+
+def test_save_settings_skips_write_when_content_is_unchanged(tmp_path, monkeypatch):
+    settings_path = tmp_path / 'settings.yaml'
+    backup_path = tmp_path / 'settings.yaml.bak'
+    monkeypatch.setattr(svc, 'SETTINGS_PATH', settings_path)
+
+    svc.save_settings({'members': {}, 'constraints': {'no_overlap': {'enabled': True}}})
+    svc.save_settings({'members': {}, 'constraints': {'no_overlap': {'enabled': False}}})
+    backup_text = backup_path.read_text(encoding='utf-8')
+    signature = svc._file_signature(settings_path)
+
+    svc.save_settings({'members': {}, 'constraints': {'no_overlap': {'enabled': False}}})
+
+    assert svc._file_signature(settings_path) == signature
+    assert backup_path.read_text(encoding='utf-8') == backup_text
+    assert svc.load_settings()['constraints']['no_overlap']['enabled'] is False
+
+
+def test_get_all_members_follows_settings_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(svc, 'SETTINGS_PATH', tmp_path / 'settings.yaml')
+    monkeypatch.setattr(svc, '_members_cache', None)
+    svc.save_settings({'members': {
+        'day_shift': {'index_1_2_group': [{'name': '佐藤'}, {'name': '山田'}]},
+        'night_shift': {'index_1_group': [{'name': '山田'}]},
+    }})
+
+    first = svc.get_all_members()
+    first.append('鈴木')
+    assert svc.get_all_members() == sorted(['佐藤', '山田'])
+
+    svc.save_settings({'members': {'day_shift': {'index_3_group': [{'name': '田中'}]}}})
+    assert svc.get_all_members() == ['田中']
+
+
+def test_get_ng_dates_yaml_text_follows_file_changes(tmp_path, monkeypatch):
+    ng_path = tmp_path / 'ng_dates.yaml'
+    monkeypatch.setattr(svc, 'NG_DATES_PATH', ng_path)
+    svc.save_ng_dates({'global': ['2026-04-01'], 'by_member': {}, 'by_period': {}})
+
+    first = svc.get_ng_dates_yaml_text()
+    assert svc.get_ng_dates_yaml_text() is first
+    assert first == svc.dump_yaml_text(svc.load_ng_dates())
+
+    svc.add_global_ng_date('2026-04-03')
+    assert '2026-04-03' in svc.get_ng_dates_yaml_text()
+
+
+def test_run_schedule_generation_reuses_result_until_inputs_change(tmp_path, monkeypatch):
+    for name, src in (
+        ('SETTINGS_PATH', 'config/settings.yaml'),
+        ('NG_DATES_PATH', 'config/ng_dates.yaml'),
+        ('CSV_PATH', 'data/duty_roster_2021_2025.csv'),
+    ):
+        target = tmp_path / Path(src).name
+        shutil.copy(src, target)
+        monkeypatch.setattr(svc, name, target)
+    monkeypatch.setattr(svc, '_last_generation', None)
+
+    ok, first, _ = svc.run_schedule_generation('2025-03-21')
+    ok_again, second, _ = svc.run_schedule_generation('2025-03-21')
+    assert ok and ok_again
+    assert second is first
+
+    svc.add_global_ng_date('2025-03-22')
+    _, third, _ = svc.run_schedule_generation('2025-03-21')
+    assert third is not first
+
+
+def test_run_schedule_generation_drops_result_after_same_size_edit(tmp_path, monkeypatch):
+    for name, src in (
+        ('SETTINGS_PATH', 'config/settings.yaml'),
+        ('NG_DATES_PATH', 'config/ng_dates.yaml'),
+        ('CSV_PATH', 'data/duty_roster_2021_2025.csv'),
+    ):
+        target = tmp_path / Path(src).name
+        shutil.copy(src, target)
+        monkeypatch.setattr(svc, name, target)
+    monkeypatch.setattr(svc, '_last_generation', None)
+
+    ok, first, _ = svc.run_schedule_generation('2025-03-21')
+    assert ok
+
+    # 同じサイズの編集がmtimeの分解能内に収まった状況を再現する
+    stat = svc.SETTINGS_PATH.stat()
+    settings = svc.load_settings()
+    settings['constraints']['interval']['min_days_between_same_person_day'] = 21
+    svc.save_settings(settings)
+    os.utime(svc.SETTINGS_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert svc.SETTINGS_PATH.stat().st_size == stat.st_size
+
+    _, second, _ = svc.run_schedule_generation('2025-03-21')
+    assert second is not first
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from web.templating import compile_templates, create_template_environment, create_template_loader
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'web' / 'templates'
+
+
+def test_compiled_templates_render_like_source(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'item.html').write_text(
+        '{% for v in values %}<li>{{ v }}</li>{% endfor %}', encoding='utf-8'
+    )
+    compiled = tmp_path / 'compiled.zip'
+    compile_templates(tmp_path / 'src', compiled)
+
+    source_env = create_template_environment(tmp_path / 'src')
+    compiled_env = create_template_environment(tmp_path / 'src', compiled)
+    values = ['<b>A</b>', '佐藤']
+
+    assert isinstance(compiled_env.loader, jinja2.ModuleLoader)
+    assert (
+        compiled_env.get_template('item.html').render(values=values)
+        == source_env.get_template('item.html').render(values=values)
+        == '<li>&lt;b&gt;A&lt;/b&gt;</li><li>佐藤</li>'
+    )
+
+
+def test_app_templates_compile(tmp_path):
+    compiled = tmp_path / 'compiled.zip'
+    compile_templates(TEMPLATE_DIR, compiled)
+
+    env = create_template_environment(TEMPLATE_DIR, compiled)
+    for name in create_template_environment(TEMPLATE_DIR).list_templates():
+        assert env.get_template(name) is not None
+
+
+def test_compiled_loader_swaps_into_directory_templates(tmp_path):
+    compiled = tmp_path / 'compiled.zip'
+    compile_templates(TEMPLATE_DIR, compiled)
+
+    templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
+    templates.env.loader = create_template_loader(TEMPLATE_DIR, compiled)
+
+    assert isinstance(templates.env.loader, jinja2.ModuleLoader)
+    assert templates.env.get_template('index.html') is not None
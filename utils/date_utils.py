@@ -47,21 +47,14 @@ def get_mondays_in_period(start_date: date, end_date: date) -> List[date]:
     Returns:
         月曜日のリスト
     """
-    mondays = []
-    current = start_date
+    # 最初の月曜日まで直接進める（0 = 月曜日）
+    first_monday = start_date + timedelta(days=(7 - start_date.weekday()) % 7)
+    if first_monday > end_date:
+        return []
 
-    # 最初の月曜日まで進める
-    while current.weekday() != 0:  # 0 = 月曜日
-        current += timedelta(days=1)
-        if current > end_date:
-            return mondays
-
-    # 期間内の全ての月曜日を収集
-    while current <= end_date:
-        mondays.append(current)
-        current += timedelta(days=7)
-
-    return mondays
+    # 以降の月曜日は週数から直接求める
+    week_count = (end_date - first_monday).days // 7 + 1
+    return [first_monday + timedelta(weeks=i) for i in range(week_count)]
 
 
 def get_weekends_in_period(start_date: date, end_date: date) -> List[date]:
@@ -76,12 +69,19 @@ def get_weekends_in_period(start_date: date, end_date: date) -> List[date]:
         土日のリスト
     """
     weekends = []
-    current = start_date
+    one_day = timedelta(days=1)
 
+    # 日曜開始の場合は先に日曜日を追加（5 = 土曜日, 6 = 日曜日）
+    if start_date.weekday() == 6 and start_date <= end_date:
+        weekends.append(start_date)
+
+    # 以降は土曜日から1週間ずつ進める
+    current = start_date + timedelta(days=(5 - start_date.weekday()) % 7)
     while current <= end_date:
-        if current.weekday() in [5, 6]:  # 5 = 土曜日, 6 = 日曜日
-            weekends.append(current)
-        current += timedelta(days=1)
+        weekends.append(current)
+        if current + one_day <= end_date:
+            weekends.append(current + one_day)
+        current += timedelta(days=7)
 
     return weekends
 
@@ -96,7 +96,7 @@ def is_weekend(target_date: date) -> bool:
     Returns:
         土日の場合True
     """
-    return target_date.weekday() in [5, 6]
+    return target_date.weekday() >= 5  # 5 = 土曜日, 6 = 日曜日
 
 
 def get_lookback_period(reference_date: date, months: int) -> Tuple[date, date]:
@@ -126,9 +126,6 @@ def date_range(start_date: date, end_date: date) -> List[date]:
     Returns:
         日付のリスト
     """
-    dates = []
-    current = start_date
-    while current <= end_date:
-        dates.append(current)
-        current += timedelta(days=1)
-    return dates
+    # 日数から直接生成する（終了日が開始日より前なら空リスト）
+    day_count = (end_date - start_date).days + 1
+    return [start_date + timedelta(days=i) for i in range(day_count)]
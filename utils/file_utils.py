@@ -0,0 +1,45 @@
+"""
+ファイル書き込みユーティリティモジュール
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+
+def replace_with_backup(
+    path: Path, backup_path: Path, write: Callable[[Path], None]
+) -> None:
+    """
+    ファイルを新しい内容で置き換え、直前の内容をバックアップとして残す
+
+    新しい内容は同じフォルダの一時ファイルに書き込んでから名前を付け替えます。
+    一時ファイル名は呼び出しごとに一意なので、同時に書き込んでも互いの一時ファイルを壊しません。
+    バックアップは旧ファイルへのハードリンクで作るため、旧ファイルを読み直して
+    コピーせずに済み、置き換えの途中でも書き込み先が欠けることはありません。
+    ハードリンクを作れないファイルシステムではコピーで代替します。
+
+    Args:
+        path: 書き込み先
+        backup_path: バックアップ先（既存のバックアップは上書き）
+        write: 一時ファイルのパスを受け取り、新しい内容を書き込む関数
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        write(tmp_path)
+        if path.exists():
+            # mkstemp は所有者のみ読み書き可で作成するため、元ファイルの権限に揃える
+            shutil.copymode(path, tmp_path)
+            backup_path.unlink(missing_ok=True)
+            try:
+                os.link(path, backup_path)
+            except OSError:
+                shutil.copy(path, backup_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -93,19 +93,31 @@ def apply_windows_window_icon(window, icon_path: Path) -> None:
 app.mount("/static", StaticFiles(directory=str(get_static_dir())), name="static")
 app.include_router(router)
 
+SERVER_STARTUP_TIMEOUT_SECONDS = 10.0
+
+
 def launch_desktop_app() -> None:
+    import time
     import uvicorn
     import threading
     import webview
 
-    def start_server():
-        """uvicornサーバーをバックグラウンドで起動"""
-        uvicorn.run(app, host="127.0.0.1", port=8000, log_level="warning")
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=8000, log_level="warning")
+    )
 
     # サーバーをバックグラウンドスレッドで起動
-    server_thread = threading.Thread(target=start_server, daemon=True)
+    server_thread = threading.Thread(target=server.run, daemon=True)
     server_thread.start()
 
+    # 待ち受け開始を確認してからウィンドウを開く（起動直後の接続エラーを防ぐ）
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT_SECONDS
+    while not server.started and server_thread.is_alive():
+        if time.monotonic() > deadline:
+            logger.warning("Server did not report startup in time. Opening window anyway.")
+            break
+        time.sleep(0.02)
+
     configure_windows_app_identity()
     icon_path = get_icon_path()
 
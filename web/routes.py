@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Request, UploadFile, File, HTTPException, Form, Query
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
 from datetime import date
 import json
-import yaml
+import sys
 
 from src.calendar_view import build_calendar_print_data
+from .templating import COMPILED_TEMPLATES_NAME, create_template_loader
 from .services import (
+    get_ng_dates_yaml_text,
+    parse_yaml_text,
     load_settings,
     save_settings,
     load_ng_dates,
     save_ng_dates,
     get_history_summary,
+    get_history_etag,
     run_schedule_generation,
     get_selected_variant_result,
     append_generated_schedule_to_history,
@@ -34,18 +39,29 @@ from .services import (
 
 router = APIRouter()
 templates = Jinja2Templates(directory=str(get_resource_path("web/templates")))
+# exe版ではビルド時にコンパイル済みのテンプレートを使用し、
+# テンプレートが変わらないため描画ごとの更新確認（stat）も省く
+_is_frozen = getattr(sys, "frozen", False)
+if _is_frozen:
+    templates.env.loader = create_template_loader(
+        get_resource_path("web/templates"),
+        get_resource_path(f"web/{COMPILED_TEMPLATES_NAME}"),
+    )
+    templates.env.auto_reload = False
 
 
 @router.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     settings = load_settings()
     ng_dates = load_ng_dates()
-    history_data = get_history_summary(page=1, page_size=50)
+    history_data = await run_in_threadpool(
+        get_history_summary, page=1, page_size=50
+    )
     current_year = date.today().year
     all_members = get_all_members()
 
     # Convert ng_dates dict to yaml string for editor (fallback)
-    ng_dates_yaml = yaml.dump(ng_dates, allow_unicode=True, default_flow_style=False)
+    ng_dates_yaml = get_ng_dates_yaml_text()
 
     return templates.TemplateResponse(
         "index.html",
@@ -66,8 +82,15 @@ async def dashboard(request: Request):
 
 @router.get("/history", response_class=HTMLResponse)
 async def get_history_table(request: Request, page: int = 1):
-    history_data = get_history_summary(page=page, page_size=50)
-    return templates.TemplateResponse(
+    # 履歴CSVが変わっていなければブラウザのキャッシュを使わせる（304）
+    etag = get_history_etag(page, 50)
+    if etag is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    history_data = await run_in_threadpool(
+        get_history_summary, page=page, page_size=50
+    )
+    response = templates.TemplateResponse(
         "components/history_table.html",
         {
             "request": request,
@@ -75,6 +98,10 @@ async def get_history_table(request: Request, page: int = 1):
             "pagination": history_data,
         },
     )
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @router.post("/history/save", response_class=JSONResponse)
@@ -104,7 +131,7 @@ async def save_history_page(request: Request):
             status_code=400,
         )
 
-    ok, msg = save_history_csv_page(page, page_size, rows)
+    ok, msg = await run_in_threadpool(save_history_csv_page, page, page_size, rows)
     if ok:
         return JSONResponse({"success": True, "message": msg})
     return JSONResponse({"success": False, "message": msg}, status_code=400)
@@ -116,11 +143,12 @@ async def update_settings(request: Request):
 
     # Reconstruct settings object from flat lists
     # First, build a map of existing member configs to preserve attributes (e.g., fixed_pattern)
-    current_settings_loaded = load_settings()
+    # 読み込みは1回だけ行い、メンバー以外の設定もこの辞書を更新して保存する
+    current_settings = load_settings()
     existing_member_configs = {}
 
-    if "members" in current_settings_loaded:
-        m = current_settings_loaded["members"]
+    if "members" in current_settings:
+        m = current_settings["members"]
 
         # Helper to extract configs
         def extract_configs(group_list):
@@ -138,10 +166,22 @@ async def update_settings(request: Request):
 
     new_settings = {"members": {"day_shift": {}, "night_shift": {}}}
 
-    def process_group(form_list_key, active_suffix):
-        members = form_data.getlist(form_list_key)
+    # getlist はキーごとにフォーム全体を走査するため、4グループ分を1回の走査で集める
+    group_keys = {
+        "day_index_1_2[]": "day",
+        "day_index_3[]": "day",
+        "night_index_1[]": "night",
+        "night_index_2[]": "night",
+    }
+    group_names = {key: [] for key in group_keys}
+    for key, value in form_data.multi_items():
+        if key in group_names:
+            group_names[key].append(value)
+
+    def process_group(form_list_key):
+        active_suffix = group_keys[form_list_key]
         group_list = []
-        for name in members:
+        for name in group_names[form_list_key]:
             # Check active status
             # key format: active_{name}_{suffix}
             active_key = f"active_{name}_{active_suffix}"
@@ -159,24 +199,21 @@ async def update_settings(request: Request):
 
     # Day Shift
     new_settings["members"]["day_shift"]["index_1_2_group"] = process_group(
-        "day_index_1_2[]", "day"
+        "day_index_1_2[]"
     )
     new_settings["members"]["day_shift"]["index_3_group"] = process_group(
-        "day_index_3[]", "day"
+        "day_index_3[]"
     )
 
     # Night Shift
     new_settings["members"]["night_shift"]["index_1_group"] = process_group(
-        "night_index_1[]", "night"
+        "night_index_1[]"
     )
     new_settings["members"]["night_shift"]["index_2_group"] = process_group(
-        "night_index_2[]", "night"
+        "night_index_2[]"
     )
 
-    # Load current settings to preserve other values
-    current_settings = load_settings()
-
-    # Update Members
+    # Update Members (other values in current_settings are preserved)
     current_settings["members"] = new_settings["members"]
 
     # Update Basic Settings
@@ -253,10 +290,12 @@ async def update_settings(request: Request):
 
 
 async def render_ng_dates_form(
-    request, message=None, error=None, active_tab="ng-global"
+    request, message=None, error=None, active_tab="ng-global", ng_dates=None
 ):
-    ng_dates = load_ng_dates()
-    ng_dates_yaml = yaml.dump(ng_dates, allow_unicode=True, default_flow_style=False)
+    # 更新直後のNG日程が渡された場合は再読み込みしない
+    if ng_dates is None:
+        ng_dates = load_ng_dates()
+    ng_dates_yaml = get_ng_dates_yaml_text()
     all_members = get_all_members()
 
     context = {
@@ -283,7 +322,7 @@ async def update_ng_dates_yaml(request: Request):
     active_tab = form_data.get("active_tab") or "ng-advanced"
 
     try:
-        data = yaml.safe_load(yaml_content)
+        data = parse_yaml_text(yaml_content)
         save_ng_dates(data)
         return await render_ng_dates_form(
             request, message="NG日程(YAML)を保存しました", active_tab=active_tab
@@ -295,69 +334,93 @@ async def update_ng_dates_yaml(request: Request):
 
 
 @router.post("/ng_dates/global/add", response_class=HTMLResponse)
-async def add_global_ng(request: Request):
-    form = await request.form()
-    date_str = form.get("date")
-    active_tab = form.get("active_tab") or "ng-global"
+async def add_global_ng(
+    request: Request,
+    date_str: str | None = Form(default=None, alias="date"),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if date_str:
-        add_global_ng_date(date_str)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = add_global_ng_date(date_str)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-global", ng_dates=ng_dates
+    )
 
 
 @router.post("/ng_dates/global/remove", response_class=HTMLResponse)
-async def remove_global_ng(request: Request):
-    form = await request.form()
-    date_str = form.get("date")
-    active_tab = form.get("active_tab") or "ng-global"
+async def remove_global_ng(
+    request: Request,
+    date_str: str | None = Form(default=None, alias="date"),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if date_str:
-        remove_global_ng_date(date_str)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = remove_global_ng_date(date_str)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-global", ng_dates=ng_dates
+    )
 
 
 @router.post("/ng_dates/member/add", response_class=HTMLResponse)
-async def add_member_ng(request: Request):
-    form = await request.form()
-    member = form.get("member")
-    date_str = form.get("date")
-    active_tab = form.get("active_tab") or "ng-member"
+async def add_member_ng(
+    request: Request,
+    member: str | None = Form(default=None),
+    date_str: str | None = Form(default=None, alias="date"),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if member and date_str:
-        add_member_ng_date(member, date_str)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = add_member_ng_date(member, date_str)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-member", ng_dates=ng_dates
+    )
 
 
 @router.post("/ng_dates/member/remove", response_class=HTMLResponse)
-async def remove_member_ng(request: Request):
-    form = await request.form()
-    member = form.get("member")
-    date_str = form.get("date")
-    active_tab = form.get("active_tab") or "ng-member"
+async def remove_member_ng(
+    request: Request,
+    member: str | None = Form(default=None),
+    date_str: str | None = Form(default=None, alias="date"),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if member and date_str:
-        remove_member_ng_date(member, date_str)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = remove_member_ng_date(member, date_str)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-member", ng_dates=ng_dates
+    )
 
 
 @router.post("/ng_dates/period/add", response_class=HTMLResponse)
-async def add_period_ng_route(request: Request):
-    form = await request.form()
-    member = form.get("member")
-    start = form.get("start")
-    end = form.get("end")
-    reason = form.get("reason")
-    active_tab = form.get("active_tab") or "ng-period"
+async def add_period_ng_route(
+    request: Request,
+    member: str | None = Form(default=None),
+    start: str | None = Form(default=None),
+    end: str | None = Form(default=None),
+    reason: str = Form(default=""),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if member and start and end:
-        add_period_ng(member, start, end, reason)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = add_period_ng(member, start, end, reason)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-period", ng_dates=ng_dates
+    )
 
 
 @router.post("/ng_dates/period/remove", response_class=HTMLResponse)
-async def remove_period_ng_route(request: Request):
-    form = await request.form()
-    member = form.get("member")
-    start = form.get("start")
-    active_tab = form.get("active_tab") or "ng-period"
+async def remove_period_ng_route(
+    request: Request,
+    member: str | None = Form(default=None),
+    start: str | None = Form(default=None),
+    active_tab: str | None = Form(default=None),
+):
+    ng_dates = None
     if member and start:
-        remove_period_ng(member, start)
-    return await render_ng_dates_form(request, active_tab=active_tab)
+        ng_dates = remove_period_ng(member, start)
+    return await render_ng_dates_form(
+        request, active_tab=active_tab or "ng-period", ng_dates=ng_dates
+    )
 
 
 # --- Bulk NG Import ---
@@ -450,8 +513,12 @@ async def generate_schedule(request: Request):
     except ValueError:
         return HTMLResponse("<div class='error'>バリアント設定が無効です</div>")
 
-    success, result, message = run_schedule_generation(
-        start_date_str, variants=variants_int, variant_top_k=variant_top_k_int
+    # 生成処理はCPUを使うため、イベントループを止めないようスレッドで実行する
+    success, result, message = await run_in_threadpool(
+        run_schedule_generation,
+        start_date_str,
+        variants=variants_int,
+        variant_top_k=variant_top_k_int,
     )
 
     if not success:
@@ -475,9 +542,13 @@ async def generate_schedule(request: Request):
 @router.post("/upload_csv", response_class=HTMLResponse)
 async def upload_csv(request: Request, files: list[UploadFile] = File(...)):
     try:
-        result = import_history_csv_files(files, csv_path=CSV_PATH)
+        result = await run_in_threadpool(
+            import_history_csv_files, files, csv_path=CSV_PATH
+        )
 
-        history_data = get_history_summary(page=1, page_size=50)
+        history_data = await run_in_threadpool(
+            get_history_summary, page=1, page_size=50
+        )
         return templates.TemplateResponse(
             "components/history_table.html",
             {
@@ -552,7 +623,8 @@ async def print_calendar(
             "<div class='error'>無効な開始日です</div>", status_code=400
         )
 
-    success, payload, message = get_selected_variant_result(
+    success, payload, message = await run_in_threadpool(
+        get_selected_variant_result,
         start_date.isoformat(),
         variant_index=variant_index,
         variants=variants,
@@ -628,7 +700,9 @@ async def save_result(request: Request):
     if schedule_json_str and str(schedule_json_str).strip():
         try:
             schedule = normalize_schedule_from_client_json(str(schedule_json_str))
-            result = append_generated_schedule_to_history(schedule, CSV_PATH)
+            result = await run_in_threadpool(
+                append_generated_schedule_to_history, schedule, CSV_PATH
+            )
             return HTMLResponse(
                 f"<div class='success'>履歴CSVに追加しました（編集反映）: {result['path']} "
                 f"(追加 {result['added_count']}件 / 重複スキップ {result['skipped_count']}件)</div>"
@@ -643,7 +717,8 @@ async def save_result(request: Request):
     except ValueError:
         return HTMLResponse("<div class='error'>バリアント設定が無効です</div>")
 
-    success, payload, message = get_selected_variant_result(
+    success, payload, message = await run_in_threadpool(
+        get_selected_variant_result,
         start_date,
         variant_index=variant_index_int,
         variants=variants_int,
@@ -651,8 +726,10 @@ async def save_result(request: Request):
     )
 
     if success:
-        result = append_generated_schedule_to_history(
-            payload["selected"]["schedule"], CSV_PATH
+        result = await run_in_threadpool(
+            append_generated_schedule_to_history,
+            payload["selected"]["schedule"],
+            CSV_PATH,
         )
         return HTMLResponse(
             f"<div class='success'>履歴CSVに追加しました: {result['path']} "
@@ -1,25 +1,38 @@
-import io
+import copy
 import json
 import yaml
 import shutil
 import sys
 import math
+import threading
+import time
 from pathlib import Path
 from datetime import date
-from typing import Dict, Any, List, Tuple, Union, Optional
+from typing import BinaryIO, Dict, Any, List, Tuple, Union, Optional
 
 import pandas as pd
 from src.data_loader import load_and_process_data, DutyRosterLoader
-from src.history_csv import append_generated_schedule_to_history
+from src.history_csv import append_generated_schedule_to_history as _append_schedule_rows
 from src.schedule_builder import ScheduleBuilder
 from src.schedule_analyzer import ScheduleAnalyzer
 from src.output_formatter import OutputFormatter
 from src.ng_text_parser import parse_ng_text
 from src.ng_status_view import build_ng_status_for_schedule
 from utils.date_utils import get_rotation_period
+from utils.file_utils import replace_with_backup
 from utils.logger import setup_logger
 
+# libyamlが使える環境ではC実装のローダー/ダンパーを使用（入出力結果は同じ）
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    _YAML_USES_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+    _YAML_USES_LIBYAML = False
+
 logger = setup_logger('web_services')
+if not _YAML_USES_LIBYAML:
+    logger.warning("libyaml is not available; falling back to the pure-Python YAML loader")
 
 APP_ROOT = (
     Path(sys.executable).resolve().parent
@@ -39,17 +52,23 @@ def get_storage_path(relative_path: str) -> Path:
     """Writable storage path anchored to the app directory."""
     return APP_ROOT / relative_path
 
-def ensure_file_exists(local_path: Path, resource_path_str: str) -> None:
-    """Ensure file exists locally, copying from bundle if necessary"""
-    if not local_path.exists():
-        bundled = get_resource_path(resource_path_str)
-        if bundled.exists() and bundled != local_path:
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                shutil.copy(bundled, local_path)
-                logger.info(f"Copied default {resource_path_str} to {local_path}")
-            except Exception as e:
-                logger.error(f"Failed to copy default file: {e}")
+def ensure_file_exists(local_path: Path, resource_path_str: str) -> bool:
+    """Ensure file exists locally, copying from bundle if necessary.
+
+    Returns whether the local file exists afterwards, so callers need no extra stat().
+    """
+    if local_path.exists():
+        return True
+    bundled = get_resource_path(resource_path_str)
+    if bundled.exists() and bundled != local_path:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copy(bundled, local_path)
+            logger.info(f"Copied default {resource_path_str} to {local_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to copy default file: {e}")
+    return False
 
 # Define writable paths relative to the app directory.
 SETTINGS_PATH = get_storage_path('config/settings.yaml')
@@ -61,47 +80,111 @@ OUTPUT_DIR = get_storage_path('data/output')
 ensure_file_exists(SETTINGS_PATH, 'config/settings.yaml')
 ensure_file_exists(NG_DATES_PATH, 'config/ng_dates.yaml')
 
+def _file_signature(path: Path) -> Tuple[int, int]:
+    """ファイルの変更検知用に (mtime_ns, size) を返す"""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+# 解析済みYAMLのキャッシュ: パス → ((mtime_ns, size), 解析結果)
+_yaml_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+# YAMLエディタ表示用のNG日程文字列: ((パス, mtime_ns, size), 文字列)
+_ng_dates_yaml_text: Optional[Tuple[Tuple, str]] = None
+# 全メンバー名: ((パス, mtime_ns, size), 昇順の名前)
+_members_cache: Optional[Tuple[Tuple, Tuple[str, ...]]] = None
+
+
+def _load_yaml_cached(path: Path, resource_path_str: str) -> Any:
+    """YAMLを読み込む（ファイルが変わっていなければ前回の解析結果を再利用）
+
+    呼び出し側が結果を書き換えてもキャッシュに影響しないよう、コピーを返します。
+    ファイルが見つからないときだけ同梱の既定ファイルからの復元を試み、
+    復元できなければ FileNotFoundError を送出します。
+    """
+    try:
+        key = _file_signature(path)
+    except FileNotFoundError:
+        if not ensure_file_exists(path, resource_path_str):
+            raise
+        key = _file_signature(path)
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = (key, yaml.load(f, Loader=_YamlLoader))
+        _yaml_cache[path] = cached
+    return copy.deepcopy(cached[1])
+
+
+def dump_yaml_text(data: Any) -> str:
+    """保存形式と同じ書式でYAML文字列に変換（画面のYAMLエディタ用）"""
+    return yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False)
+
+
+def parse_yaml_text(text: str) -> Any:
+    """画面から送られたYAML文字列を解析"""
+    return yaml.load(text, Loader=_YamlLoader)
+
+
 def load_settings() -> Dict[str, Any]:
-    ensure_file_exists(SETTINGS_PATH, 'config/settings.yaml')
-    if not SETTINGS_PATH.exists():
+    try:
+        return _load_yaml_cached(SETTINGS_PATH, 'config/settings.yaml')
+    except FileNotFoundError:
         return {}
-    with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+
+def _save_yaml_with_backup(path: Path, data: Any) -> None:
+    """YAMLを保存し、直前の内容を .yaml.bak に残す（旧ファイルの再読み込み・コピーなし）"""
+    text = dump_yaml_text(data)
+    # 内容が変わらない保存（設定画面の再送信など）は書き込みもバックアップ更新もしない
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return
+    except (OSError, UnicodeDecodeError):
+        pass
+    _yaml_cache.pop(path, None)
+    replace_with_backup(
+        path,
+        path.with_suffix('.yaml.bak'),
+        lambda tmp_path: tmp_path.write_text(text, encoding='utf-8'),
+    )
 
 def save_settings(data: Dict[str, Any]) -> None:
-    # Backup before saving
-    if SETTINGS_PATH.exists():
-        shutil.copy(SETTINGS_PATH, SETTINGS_PATH.with_suffix('.yaml.bak'))
-    else:
-        SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(SETTINGS_PATH, 'w', encoding='utf-8') as f:
-        yaml.safe_dump(data, f, allow_unicode=True, default_flow_style=False)
+    global _members_cache
+    _members_cache = None
+    _save_yaml_with_backup(SETTINGS_PATH, data)
+    _invalidate_generation_cache()
 
 def load_ng_dates() -> Dict[str, Any]:
-    ensure_file_exists(NG_DATES_PATH, 'config/ng_dates.yaml')
-    if not NG_DATES_PATH.exists():
+    try:
+        data = _load_yaml_cached(NG_DATES_PATH, 'config/ng_dates.yaml')
+    except FileNotFoundError:
         return {}
-    with open(NG_DATES_PATH, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
-        if not data: data = {}
-        
-        # Unwrap 'ng_dates' key if it exists (legacy/file format wrapper)
-        if 'ng_dates' in data:
-            data = data['ng_dates']
-        
-        # Ensure basic structure
-        if 'global' not in data: data['global'] = []
-        if 'by_member' not in data: data['by_member'] = {}
-        if 'by_period' not in data: data['by_period'] = {}
-        return data
+    if not data: data = {}
+
+    # Unwrap 'ng_dates' key if it exists (legacy/file format wrapper)
+    if 'ng_dates' in data:
+        data = data['ng_dates']
+
+    # Ensure basic structure
+    if 'global' not in data: data['global'] = []
+    if 'by_member' not in data: data['by_member'] = {}
+    if 'by_period' not in data: data['by_period'] = {}
+    return data
+
+def get_ng_dates_yaml_text() -> str:
+    """NG日程をYAMLエディタ用の文字列で取得（ファイルが変わっていなければ前回の結果を再利用）"""
+    global _ng_dates_yaml_text
+    try:
+        key = (NG_DATES_PATH, *_file_signature(NG_DATES_PATH))
+    except FileNotFoundError:
+        return dump_yaml_text(load_ng_dates())
+    cached = _ng_dates_yaml_text
+    if cached is None or cached[0] != key:
+        cached = (key, dump_yaml_text(load_ng_dates()))
+        _ng_dates_yaml_text = cached
+    return cached[1]
 
 def save_ng_dates(data: Dict[str, Any]) -> None:
-    if NG_DATES_PATH.exists():
-        shutil.copy(NG_DATES_PATH, NG_DATES_PATH.with_suffix('.yaml.bak'))
-    else:
-        NG_DATES_PATH.parent.mkdir(parents=True, exist_ok=True)
-    
+    global _ng_dates_yaml_text
     # Wrap in 'ng_dates' key only if not already present
     # (Since we unwrap in load, we usually need to wrap here)
     if 'ng_dates' not in data:
@@ -109,25 +192,36 @@ def save_ng_dates(data: Dict[str, Any]) -> None:
     else:
         output_data = data
 
-    with open(NG_DATES_PATH, 'w', encoding='utf-8') as f:
-        yaml.safe_dump(output_data, f, allow_unicode=True, default_flow_style=False)
+    _ng_dates_yaml_text = None
+    _save_yaml_with_backup(NG_DATES_PATH, output_data)
+    _invalidate_generation_cache()
+    # 各ヘルパーの保存直後は画面を再描画するため、YAMLエディタ用の文字列を先に用意する
+    # （load_ng_dates と同じ形のデータのみ。ファイルを解析し直さずに済む）
+    if output_data is not data and all(k in data for k in ('global', 'by_member', 'by_period')):
+        _ng_dates_yaml_text = (
+            (NG_DATES_PATH, *_file_signature(NG_DATES_PATH)),
+            dump_yaml_text(data),
+        )
 
 # --- NG Dates Helpers ---
+# 各ヘルパーは更新後のNG日程を返す（画面の再描画でファイルを読み直さないため）
 
-def add_global_ng_date(date_str: str) -> None:
+def add_global_ng_date(date_str: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if date_str not in data['global']:
         data['global'].append(date_str)
         data['global'].sort()
         save_ng_dates(data)
+    return data
 
-def remove_global_ng_date(date_str: str) -> None:
+def remove_global_ng_date(date_str: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if date_str in data['global']:
         data['global'].remove(date_str)
         save_ng_dates(data)
+    return data
 
-def add_member_ng_date(member: str, date_str: str) -> None:
+def add_member_ng_date(member: str, date_str: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if member not in data['by_member']:
         data['by_member'][member] = []
@@ -136,8 +230,9 @@ def add_member_ng_date(member: str, date_str: str) -> None:
         data['by_member'][member].append(date_str)
         data['by_member'][member].sort()
         save_ng_dates(data)
+    return data
 
-def remove_member_ng_date(member: str, date_str: str) -> None:
+def remove_member_ng_date(member: str, date_str: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if member in data['by_member'] and date_str in data['by_member'][member]:
         data['by_member'][member].remove(date_str)
@@ -145,8 +240,9 @@ def remove_member_ng_date(member: str, date_str: str) -> None:
         if not data['by_member'][member]:
             del data['by_member'][member]
         save_ng_dates(data)
+    return data
 
-def add_period_ng(member: str, start: str, end: str, reason: str) -> None:
+def add_period_ng(member: str, start: str, end: str, reason: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if member not in data['by_period']:
         data['by_period'][member] = []
@@ -158,21 +254,39 @@ def add_period_ng(member: str, start: str, end: str, reason: str) -> None:
         # Sort by start date
         data['by_period'][member].sort(key=lambda x: x['start'])
         save_ng_dates(data)
+    return data
 
-def remove_period_ng(member: str, start: str) -> None:
+def remove_period_ng(member: str, start: str) -> Dict[str, Any]:
     data = load_ng_dates()
     if member in data['by_period']:
-        data['by_period'][member] = [
-            p for p in data['by_period'][member] 
-            if p['start'] != start
-        ]
-        if not data['by_period'][member]:
+        periods = data['by_period'][member]
+        remaining = [p for p in periods if p['start'] != start]
+        # 一致する期間がなければ書き込まない（二重クリック等の無操作リクエスト）
+        if len(remaining) == len(periods) and remaining:
+            return data
+        data['by_period'][member] = remaining
+        if not remaining:
             del data['by_period'][member]
         save_ng_dates(data)
+    return data
 
 def get_all_members() -> List[str]:
     """Extract all unique member names from settings"""
-    settings = load_settings()
+    # NG日程画面を描画するたびに呼ばれるため、設定ファイルが変わるまで結果を再利用する
+    global _members_cache
+    try:
+        key = (SETTINGS_PATH, *_file_signature(SETTINGS_PATH))
+    except FileNotFoundError:
+        return _collect_member_names(load_settings())
+    cached = _members_cache
+    if cached is None or cached[0] != key:
+        cached = (key, tuple(_collect_member_names(load_settings())))
+        _members_cache = cached
+    return list(cached[1])
+
+
+def _collect_member_names(settings: Dict[str, Any]) -> List[str]:
+    """設定の全グループからメンバー名を重複なしで昇順に集める"""
     members = set()
     
     def extract_from_group(group_list):
@@ -192,9 +306,20 @@ def get_all_members() -> List[str]:
     return sorted(list(members))
 
 
-def _read_history_dataframe_from_bytes(content: bytes, source_name: str) -> pd.DataFrame:
+# 履歴CSVの読み込み→変更→書き込みを直列化する（各処理はスレッドプールで並行に呼ばれる）
+_history_write_lock = threading.Lock()
+
+
+def _invalidate_history_cache() -> None:
+    """履歴CSVを書き換えた後に呼ぶ（mtimeの分解能に依存せず確実に読み直す）"""
+    global _history_cache, _history_version
+    _history_cache = None
+    _history_version += 1
+
+
+def _read_history_dataframe(source: BinaryIO, source_name: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(io.BytesIO(content))
+        df = pd.read_csv(source)
     except Exception as e:
         raise ValueError(f"{source_name}: CSVの読み込みに失敗しました: {e}") from e
 
@@ -226,11 +351,13 @@ def import_history_csv_files(
         if Path(filename).suffix.lower() != ".csv":
             raise ValueError(f"{filename}: CSVファイルのみ取り込み可能です")
 
-        content = uploaded_file.file.read()
-        if not content:
+        # 空ファイル判定は先頭1バイトのみ読み、CSV本体はストリームのまま解析する
+        stream = uploaded_file.file
+        if not stream.read(1):
             continue
+        stream.seek(0)
 
-        imported_frames.append(_read_history_dataframe_from_bytes(content, filename))
+        imported_frames.append(_read_history_dataframe(stream, filename))
         imported_names.append(filename)
 
     if not imported_frames:
@@ -246,11 +373,14 @@ def import_history_csv_files(
     ).reset_index(drop=True)
     merged_df["date"] = merged_df["date"].dt.strftime("%Y-%m-%d")
 
-    target.parent.mkdir(parents=True, exist_ok=True)
-    if target.exists():
-        shutil.copy(target, target.with_suffix(".bak"))
-
-    merged_df.to_csv(target, index=False, encoding="utf-8-sig")
+    with _history_write_lock:
+        replace_with_backup(
+            target,
+            target.with_suffix(".bak"),
+            lambda tmp_path: merged_df.to_csv(tmp_path, index=False, encoding="utf-8-sig"),
+        )
+        _invalidate_history_cache()
+        _invalidate_generation_cache()
 
     return {
         "path": str(target),
@@ -339,9 +469,13 @@ def bulk_apply_ng_dates(entries: List[Dict]) -> int:
         if member not in data["by_member"]:
             data["by_member"][member] = []
 
+        # 既存日付との重複判定はリスト走査ではなく集合で行う
+        member_dates = data["by_member"][member]
+        known = set(member_dates)
         for date_str in dates:
-            if date_str not in data["by_member"][member]:
-                data["by_member"][member].append(date_str)
+            if date_str not in known:
+                known.add(date_str)
+                member_dates.append(date_str)
                 count += 1
 
         data["by_member"][member].sort()
@@ -355,21 +489,28 @@ def bulk_apply_ng_dates(entries: List[Dict]) -> int:
 
 def _history_rows_for_template(df_page: pd.DataFrame) -> List[Dict[str, Any]]:
     """テンプレート用に日付・数値を表示しやすい形へ。"""
+    # 行ごとのSeries生成を避け、列をリスト化してまとめて走査する
+    def column_values(name: str) -> List[Any]:
+        if name in df_page.columns:
+            return df_page[name].tolist()
+        return [None] * len(df_page)
+
     rows: List[Dict[str, Any]] = []
-    for _, r in df_page.iterrows():
+    for date_raw, sc_raw, si_raw, pn_raw in zip(
+        column_values("date"),
+        column_values("shift_category"),
+        column_values("shift_index"),
+        column_values("person_name"),
+    ):
         date_val = ""
-        if "date" in r.index and pd.notna(r["date"]):
-            date_val = pd.Timestamp(r["date"]).strftime("%Y-%m-%d")
+        if pd.notna(date_raw):
+            date_val = pd.Timestamp(date_raw).strftime("%Y-%m-%d")
         try:
-            si = int(r["shift_index"]) if pd.notna(r.get("shift_index")) else 1
+            si = int(si_raw) if pd.notna(si_raw) else 1
         except (TypeError, ValueError):
             si = 1
-        pn = ""
-        if "person_name" in r.index and pd.notna(r.get("person_name")):
-            pn = str(r["person_name"]).strip()
-        sc = ""
-        if "shift_category" in r.index and pd.notna(r.get("shift_category")):
-            sc = str(r["shift_category"]).strip()
+        pn = str(pn_raw).strip() if pd.notna(pn_raw) else ""
+        sc = str(sc_raw).strip() if pd.notna(sc_raw) else ""
         rows.append(
             {
                 "date": date_val,
@@ -381,6 +522,58 @@ def _history_rows_for_template(df_page: pd.DataFrame) -> List[Dict[str, Any]]:
     return rows
 
 
+# 日付の降順に並べた履歴CSVのキャッシュ: ((パス, mtime_ns, size), DataFrame)
+_history_cache: Optional[Tuple[Tuple, pd.DataFrame]] = None
+# アプリ内で履歴CSVを書き換えるたびに進める番号（ETagに含める）
+_history_version = 0
+
+
+def _load_sorted_history(path: Path) -> Tuple[Optional[pd.DataFrame], List[str]]:
+    """
+    履歴CSVを読み込み、日付の降順に並べて返す
+
+    ファイルが変わっていなければ前回の結果を再利用します。返すDataFrameは
+    共有されるため、書き換える場合は呼び出し側でコピーしてください。
+
+    Returns:
+        (並べ替え済みDataFrame, 不足している列)。列が不足している場合はDataFrameがNone
+    """
+    global _history_cache
+    key = (path, *_file_signature(path))
+    cached = _history_cache
+    if cached is not None and cached[0] == key:
+        return cached[1], []
+
+    df = pd.read_csv(path)
+    missing = [c for c in REQUIRED_HISTORY_COLUMNS if c not in df.columns]
+    if missing:
+        return None, missing
+
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date", ascending=False).reset_index(drop=True)
+    _history_cache = (key, df)
+    return df, []
+
+
+# ETagに含めるプロセス固有値（再起動・アプリ更新後はブラウザのキャッシュを使わない）
+_HISTORY_ETAG_SALT = format(time.time_ns(), 'x')
+
+
+def get_history_etag(page: int, page_size: int) -> Optional[str]:
+    """履歴ページのETag（履歴CSVが変わらない間は同じ値、CSVがなければNone）
+
+    同じサイズの編集がmtimeの分解能内に収まっても値が変わるよう、書き換え番号も含めます。
+    """
+    try:
+        mtime_ns, size = _file_signature(CSV_PATH)
+    except OSError:
+        return None
+    return (
+        f'W/"{mtime_ns:x}-{size:x}-{_history_version:x}-{page}-{page_size}'
+        f'-{_HISTORY_ETAG_SALT}"'
+    )
+
+
 def get_history_summary(page: int = 1, page_size: int = 50) -> Dict[str, Any]:
     empty = {
         "data": [],
@@ -395,16 +588,11 @@ def get_history_summary(page: int = 1, page_size: int = 50) -> Dict[str, Any]:
         return empty
 
     try:
-        df = pd.read_csv(CSV_PATH)
-        required = ["date", "shift_category", "shift_index", "person_name"]
-        missing = [c for c in required if c not in df.columns]
+        df, missing = _load_sorted_history(CSV_PATH)
         if missing:
             logger.error(f"履歴CSVに必要な列がありません: {missing}")
             return empty
 
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.sort_values("date", ascending=False).reset_index(drop=True)
-
         total_count = len(df)
         total_pages = math.ceil(total_count / page_size) if page_size > 0 else 0
 
@@ -441,22 +629,32 @@ def save_history_csv_page(
     履歴CSVのうち、指定ページに相当する行だけを上書き保存する。
     表示と同じく日付の降順で並べた位置（iloc）に適用する。
     """
+    # 同時に保存されても互いの編集を上書きで失わないよう、読み込みから置き換えまで直列化する
+    with _history_write_lock:
+        return _save_history_csv_page_locked(page, page_size, rows, csv_path)
+
+
+def _save_history_csv_page_locked(
+    page: int,
+    page_size: int,
+    rows: List[Dict[str, Any]],
+    csv_path: Optional[Path],
+) -> Tuple[bool, str]:
+    """save_history_csv_page の本体（_history_write_lock を保持して呼ぶ）"""
     target = csv_path if csv_path is not None else CSV_PATH
     if not target.exists():
         return False, "CSVファイルがありません"
 
-    required_cols = ["date", "shift_category", "shift_index", "person_name"]
     try:
-        df = pd.read_csv(target)
+        df, miss = _load_sorted_history(target)
     except Exception as e:
         return False, f"CSVの読み込みに失敗しました: {e}"
 
-    miss = [c for c in required_cols if c not in df.columns]
     if miss:
         return False, f"必要な列がありません: {', '.join(miss)}"
 
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date", ascending=False).reset_index(drop=True)
+    # キャッシュと共有しているため、編集用にコピーする
+    df = df.copy()
 
     total = len(df)
     if page < 1 or page_size < 1:
@@ -499,13 +697,100 @@ def save_history_csv_page(
         df.at[pos, "shift_index"] = idx
         df.at[pos, "person_name"] = name
 
-    target.parent.mkdir(parents=True, exist_ok=True)
-    if target.exists():
-        shutil.copy(target, target.with_suffix(".bak"))
-
-    df.to_csv(target, index=False, encoding="utf-8-sig")
+    replace_with_backup(
+        target,
+        target.with_suffix(".bak"),
+        lambda tmp_path: df.to_csv(tmp_path, index=False, encoding="utf-8-sig"),
+    )
+    _invalidate_history_cache()
+    _invalidate_generation_cache()
     return True, "履歴CSVを保存しました（.bak にバックアップ済み）"
 
+def append_generated_schedule_to_history(
+    schedule: Dict, csv_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """生成したスケジュールを履歴CSVへ追記（他の履歴書き込みと直列化する）"""
+    target = csv_path if csv_path is not None else CSV_PATH
+    with _history_write_lock:
+        result = _append_schedule_rows(schedule, csv_path=target)
+        _invalidate_history_cache()
+        _invalidate_generation_cache()
+    return result
+
+def _schedule_fingerprint(schedule: Dict) -> Tuple:
+    """スケジュールの内容を比較用のタプルに変換（同一内容なら同じ値）"""
+    return tuple(sorted(
+        (shift_type, target_date, index, member)
+        for shift_type in ('day', 'night')
+        for target_date, indexes in schedule.get(shift_type, {}).items()
+        for index, member in indexes.items()
+    ))
+
+
+def _build_variant_result(
+    builder: ScheduleBuilder,
+    variant_index: int,
+    start_date: date,
+    end_date: date,
+    member_stats: Dict,
+    ng_dates: Dict[str, Any],
+    formatter: OutputFormatter,
+    summary_cache: Optional[Dict[Tuple, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    1バリアント分のスケジュールを生成し、統計・分析結果をまとめる
+
+    バリアント同士は独立しており、制約違反時はValueErrorを送出します。
+    summary_cacheを渡すと、既出のバリアントと同一内容のスケジュールでは
+    統計・分析・NG状況を再計算せずに使い回します。
+    """
+    schedule = builder.build_schedule(start_date, end_date)
+
+    fingerprint = None
+    if summary_cache is not None:
+        fingerprint = _schedule_fingerprint(schedule)
+        summary = summary_cache.get(fingerprint)
+        if summary is not None:
+            logger.debug(
+                "Variant %d duplicates variant %d; reusing its summary",
+                variant_index, summary['variant_index']
+            )
+            return {**summary, 'variant_index': variant_index, 'schedule': schedule}
+
+    statistics = formatter.generate_statistics(schedule, member_stats)
+    analyzer = ScheduleAnalyzer(schedule, member_stats)
+    analysis_result = analyzer.analyze()
+    ng_status = build_ng_status_for_schedule(schedule, ng_dates)
+
+    result = {
+        'variant_index': variant_index,
+        'schedule': schedule,
+        'statistics': statistics,
+        'analysis': analysis_result,
+        'ng_status': ng_status,
+    }
+    if fingerprint is not None:
+        summary_cache[fingerprint] = result
+    return result
+
+
+# 直近の生成結果: (入力キー, 結果)。保存・印刷時に同じ入力で再生成しないため
+_last_generation: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+# 入力ファイルをアプリ内で書き換えるたびに進める番号（入力キーに含める）
+_generation_inputs_version = 0
+
+
+def _invalidate_generation_cache() -> None:
+    """設定・NG日程・履歴CSVを書き換えた後に呼ぶ
+
+    同じサイズの編集がmtimeの分解能内に収まると署名だけでは変化を検知できないため、
+    前回結果を捨てるとともに版番号を進め、生成中だった結果も再利用されないようにする。
+    """
+    global _last_generation, _generation_inputs_version
+    _generation_inputs_version += 1
+    _last_generation = None
+
+
 def run_schedule_generation(
     start_date_str: str,
     variants: int = 1,
@@ -514,20 +799,38 @@ def run_schedule_generation(
     """
     Returns (success, result_data, message)
     """
+    global _last_generation
     try:
         start_date = date.fromisoformat(start_date_str)
         _, end_date = get_rotation_period(start_date)
         
         # Check files (and attempt to copy defaults if missing)
-        ensure_file_exists(SETTINGS_PATH, 'config/settings.yaml')
-        ensure_file_exists(NG_DATES_PATH, 'config/ng_dates.yaml')
+        settings_ok = ensure_file_exists(SETTINGS_PATH, 'config/settings.yaml')
+        ng_dates_ok = ensure_file_exists(NG_DATES_PATH, 'config/ng_dates.yaml')
         
-        if not SETTINGS_PATH.exists() or not NG_DATES_PATH.exists():
+        if not settings_ok or not ng_dates_ok:
              return False, None, "Config files missing and could not be restored."
              
         if not CSV_PATH.exists():
              return False, None, f"History CSV not found at {CSV_PATH}. Please upload data."
 
+        variant_count = max(1, int(variants))
+        variant_top_k = max(1, int(variant_top_k))
+
+        # 入力（開始日・バリアント設定・各ファイル）が前回と同じなら結果を再利用
+        cache_key = (
+            start_date, variant_count, variant_top_k,
+            _generation_inputs_version,
+            _file_signature(SETTINGS_PATH),
+            _file_signature(NG_DATES_PATH),
+            _file_signature(CSV_PATH),
+        )
+        # 生成はスレッドで並行実行されうるため、参照は1回だけ取り出して使う
+        last_generation = _last_generation
+        if last_generation is not None and last_generation[0] == cache_key:
+            logger.debug("Reusing the previous generation result")
+            return True, last_generation[1], "Schedule generated successfully"
+
         # Load data
         # Note: load_and_process_data takes path string. 
         # Since we are using local files, passing str(CSV_PATH) is correct.
@@ -536,40 +839,35 @@ def run_schedule_generation(
             lookback_months=2
         )
 
+        # 設定はここで1回だけ読み込み、全バリアントのビルダーで共有する
+        settings = load_settings()
         ng_dates = load_ng_dates()
-
-        variant_count = max(1, int(variants))
-        variant_top_k = max(1, int(variant_top_k))
+        ng_dates_config = {'ng_dates': ng_dates}
 
         formatter = OutputFormatter()
         variant_results = []
         failures = []
+        # 同じ入力のバリアント間で候補順位を共有（割り当て履歴が同じ枠は再計算しない）
+        rank_cache = {}
+        # 同一内容になったバリアントは統計・分析を使い回す
+        summary_cache = {}
 
         for variant_index in range(variant_count):
             builder = ScheduleBuilder(
-                str(SETTINGS_PATH),
-                str(NG_DATES_PATH),
+                settings,
+                ng_dates_config,
                 member_stats,
                 df_recent,
                 variant_index=variant_index,
-                variant_top_k=variant_top_k
+                variant_top_k=variant_top_k,
+                rank_cache=rank_cache
             )
 
             try:
-                schedule = builder.build_schedule(start_date, end_date)
-
-                statistics = formatter.generate_statistics(schedule, member_stats)
-                analyzer = ScheduleAnalyzer(schedule, member_stats)
-                analysis_result = analyzer.analyze()
-                ng_status = build_ng_status_for_schedule(schedule, ng_dates)
-
-                variant_results.append({
-                    'variant_index': variant_index,
-                    'schedule': schedule,
-                    'statistics': statistics,
-                    'analysis': analysis_result,
-                    'ng_status': ng_status,
-                })
+                variant_results.append(_build_variant_result(
+                    builder, variant_index, start_date, end_date,
+                    member_stats, ng_dates, formatter, summary_cache
+                ))
             except ValueError as e:
                 failures.append({
                     'variant_index': variant_index,
@@ -587,6 +885,7 @@ def run_schedule_generation(
             'variant_count': variant_count,
             'variant_top_k': variant_top_k
         }
+        _last_generation = (cache_key, result)
 
         return True, result, "Schedule generated successfully"
         
@@ -0,0 +1,64 @@
+"""
+テンプレート環境モジュール
+
+ソース実行時はテンプレートファイルを直接読み込み、exe版ではビルド時に
+事前コンパイルしたテンプレート（zip）を読み込んで初回描画時のコンパイルを省きます。
+"""
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+
+COMPILED_TEMPLATES_NAME = "templates_compiled.zip"
+
+
+def create_template_loader(
+    template_dir: Path, compiled_path: Optional[Path] = None
+) -> jinja2.BaseLoader:
+    """
+    テンプレートローダーを作成
+
+    Jinja2Templates(directory=...) で作った環境の loader を差し替えて使います
+    （env= 引数は古いStarletteにないため）。
+
+    Args:
+        template_dir: テンプレートディレクトリ
+        compiled_path: 事前コンパイル済みテンプレートのzip（存在しなければ未使用）
+
+    Returns:
+        zipがあれば ModuleLoader、なければ FileSystemLoader
+    """
+    if compiled_path is not None and compiled_path.exists():
+        return jinja2.ModuleLoader(str(compiled_path))
+    return jinja2.FileSystemLoader(str(template_dir))
+
+
+def create_template_environment(
+    template_dir: Path, compiled_path: Optional[Path] = None
+) -> jinja2.Environment:
+    """
+    テンプレート環境を作成（ビルド時のコンパイルとテストで使用）
+
+    Args:
+        template_dir: テンプレートディレクトリ
+        compiled_path: 事前コンパイル済みテンプレートのzip（存在しなければ未使用）
+
+    Returns:
+        Starlette の既定と同じ autoescape=True の Environment
+    """
+    return jinja2.Environment(
+        loader=create_template_loader(template_dir, compiled_path), autoescape=True
+    )
+
+
+def compile_templates(template_dir: Path, target: Path) -> None:
+    """
+    テンプレートを事前コンパイルしてzipに保存（ビルド時に使用）
+
+    Args:
+        template_dir: テンプレートディレクトリ
+        target: 出力先zipファイル
+    """
+    env = create_template_environment(template_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    env.compile_templates(str(target), zip="deflated", ignore_errors=False)